@@ -7,22 +7,41 @@ Version: 1.0.1 (Fixed)
 """
 
 import os
+import sys
 import logging
+import logging.handlers
+import queue
+import threading
+import time
 import secrets
 import hashlib
+import hmac
 import re
-import random
+import io
+import csv
 import asyncio
+import functools
+from contextlib import contextmanager
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from decimal import Decimal
-from typing import Optional, Dict, Any, List, Tuple
+from itertools import islice
+from zoneinfo import ZoneInfo
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Optional, Dict, Any, List, Tuple, Awaitable
 
-import pytz
+from cachetools import TTLCache
+import orjson
 import psycopg2
+from psycopg2 import sql
 from psycopg2.extras import RealDictCursor
+from psycopg2.extensions import connection as PgConnection
+from psycopg2.pool import ThreadedConnectionPool
 
-from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
+from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup
 from telegram.constants import ParseMode
+from telegram.error import TelegramError
+from telegram.request import HTTPXRequest
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -30,6 +49,7 @@ from telegram.ext import (
     CallbackQueryHandler,
     ConversationHandler,
     ContextTypes,
+    BaseUpdateProcessor,
     filters,
 )
 
@@ -39,6 +59,10 @@ from telegram.ext import (
 
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 ADMIN_ID = int(os.getenv("ADMIN_ID", "0"))
+# Additional admins (comma-separated); ADMIN_ID stays the notification target
+ADMIN_IDS = frozenset(
+    {ADMIN_ID} | {int(x) for x in os.getenv("ADMIN_IDS", "").split(",") if x.strip()}
+)
 DATABASE_URL = os.getenv("DATABASE_URL")
 SUPPORT_USERNAME = os.getenv("SUPPORT_USERNAME", "PillarDigitalBankCS47")
 
@@ -49,7 +73,11 @@ USDT_ADDRESS = "0x13c7acDfBc5842C311dEB2f33D98f62d02Bc4f37"
 USDC_ADDRESS = "0x13c7acDfBc5842C311dEB2f33D98f62d02Bc4f37"
 
 # Timezone
-NY_TZ = pytz.timezone("America/New_York")
+NY_TZ = ZoneInfo("America/New_York")
+
+# Banking Hours (NY time)
+BANKING_OPEN_HOUR = 8
+BANKING_CLOSE_HOUR = 16
 
 # Validation
 if not BOT_TOKEN:
@@ -77,801 +105,1703 @@ if ADMIN_ID == 0:
 OTP_EXPIRY_MINUTES = 10
 OTP_LENGTH = 6
 
+# Savings Interest
+ONE_DAY = timedelta(days=1)
+
 # Registration Bonus
-REGISTRATION_BONUS = Decimal('5.00')
-REFERRAL_BONUS = Decimal('1.00')
+REGISTRATION_BONUS_CENTS = 500
+REFERRAL_BONUS_CENTS = 100
+REGISTRATION_BONUS = Decimal(REGISTRATION_BONUS_CENTS).scaleb(-2)
+
+# Amount Limits
+ZERO = Decimal('0')
+MAX_AMOUNT = Decimal('1000000')
+
+# Money columns held as int cents (BIGINT in Postgres, int in the in-memory store)
+ACCOUNT_MONEY_FIELDS = (
+    'balance', 'locked_balance', 'available_balance',
+    'total_deposits', 'total_withdrawals', 'total_interest_earned'
+)
+USER_BALANCE_FIELDS = ('balance', 'available_balance', 'locked_balance')
+
+# Display masking; longer than any stored email or phone (VARCHAR(255))
+MASK_STARS = '*' * 255
+
+# Password Hashing (scrypt)
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_SALT_BYTES = 16
+
+# User Row Cache
+USER_CACHE_SIZE = 10_000
+USER_CACHE_TTL = 60  # seconds
+
+# Account Row Cache; short-lived because balances change often
+ACCOUNT_CACHE_SIZE = 10_000
+ACCOUNT_CACHE_TTL = 5  # seconds
+
+# Savings Plan Template Cache
+TEMPLATE_CACHE_TTL = 300  # seconds
+
+# Admin Listings
+ADMIN_USERS_PAGE_SIZE = 10
+
+# Schema marker stored as the users table comment; bump when the DDL changes
+SCHEMA_VERSION = "pillar-schema-9"
+
+# Retries for server-generated codes that hit a UNIQUE collision
+GENERATED_ID_ATTEMPTS = 5
+
+# Connection Pool
+DB_POOL_MAX = 20
+# The pool closes returned connections beyond minconn, losing their prepared
+# statements, so every connection stays open
+DB_POOL_MIN = DB_POOL_MAX
+# Extra connection held back for the audit writer thread, which runs outside
+# the DB_POOL_MAX executor workers
+DB_POOL_RESERVED = 1
+
+# Due savings interest for one user's active plans ($1 = user, $2 = time zone):
+# logs each day, advances the plans and leaves per-plan sums in `totals`.
+SAVINGS_INTEREST_CTE = """
+    WITH due AS (
+        SELECT p.id, d::date AS calc_date, p.principal_amount, p.daily_rate
+        FROM user_savings_plans p
+        CROSS JOIN LATERAL generate_series(
+            (COALESCE((p.last_interest_calc AT TIME ZONE $2)::date, p.start_date) + 1)::timestamp,
+            LEAST((NOW() AT TIME ZONE $2)::date, p.end_date)::timestamp,
+            interval '1 day'
+        ) AS d
+        WHERE p.user_telegram_id = $1 AND p.status = 'ACTIVE'
+        FOR UPDATE OF p
+    ),
+    logged AS (
+        INSERT INTO daily_interest_logs 
+        (user_telegram_id, savings_plan_id, calculation_date, 
+         interest_amount, principal_amount, daily_rate)
+        SELECT $1, id, calc_date, principal_amount * daily_rate, principal_amount, daily_rate
+        FROM due
+        RETURNING savings_plan_id, calculation_date, interest_amount
+    ),
+    totals AS (
+        SELECT savings_plan_id, SUM(interest_amount) AS interest, MAX(calculation_date) AS last_date
+        FROM logged
+        GROUP BY savings_plan_id
+    ),
+    advanced AS (
+        UPDATE user_savings_plans p
+        SET interest_earned = p.interest_earned + t.interest,
+            current_value = p.current_value + t.interest,
+            last_interest_calc = t.last_date::timestamp AT TIME ZONE $2,
+            updated_at = NOW()
+        FROM totals t
+        WHERE p.id = t.savings_plan_id
+    )
+"""
+
+# Hot-path queries, prepared server-side once per connection: name -> (arg types, SQL)
+PREPARED_STATEMENTS = {
+    'get_user': ("bigint", "SELECT * FROM users WHERE telegram_id = $1"),
+    'get_user_by_email': ("text", "SELECT * FROM users WHERE email = $1"),
+    'email_exists': ("text", "SELECT 1 FROM users WHERE email = $1 LIMIT 1"),
+    'get_user_by_referral': ("text", "SELECT * FROM users WHERE referral_code = $1"),
+    'get_account': ("bigint", "SELECT * FROM accounts WHERE user_telegram_id = $1"),
+    'get_user_transactions': ("bigint, integer", """
+        SELECT transaction_id, type, amount, COALESCE(method, 'BANK'), status, requested_at
+        FROM transactions
+        WHERE user_telegram_id = $1
+        ORDER BY requested_at DESC
+        LIMIT $2
+    """),
+    'create_transaction': ("text, bigint, text, text, bigint, text, text", """
+        INSERT INTO transactions
+        (transaction_id, user_telegram_id, type, method, amount, net_amount,
+         crypto_currency, crypto_address, status, requested_at)
+        VALUES ($1, $2, $3, $4, $5, $5, $6, $7, 'PENDING', NOW())
+        RETURNING transaction_id
+    """),
+    'get_user_savings_plans': ("bigint", """
+        SELECT *,
+               CURRENT_DATE - start_date AS progress_days,
+               end_date - start_date AS total_days,
+               COALESCE(LEAST(100, (CURRENT_DATE - start_date) * 100
+                                   / NULLIF(end_date - start_date, 0)), 100) AS progress_pct
+        FROM user_savings_plans
+        WHERE user_telegram_id = $1
+        ORDER BY created_at DESC
+    """),
+    'apply_interest_and_fetch': ("bigint, text", SAVINGS_INTEREST_CTE + """,
+    credited AS (
+        UPDATE accounts a
+        SET balance = a.balance + c.cents,
+            available_balance = a.available_balance + c.cents,
+            total_interest_earned = a.total_interest_earned + c.cents,
+            updated_at = NOW()
+        FROM (SELECT round(SUM(interest) * 100)::bigint AS cents FROM totals) c
+        WHERE a.user_telegram_id = $1 AND c.cents > 0
+        RETURNING a.*
+    )
+    SELECT * FROM credited
+    UNION ALL
+    SELECT * FROM accounts
+    WHERE user_telegram_id = $1 AND NOT EXISTS (SELECT 1 FROM credited)
+    """),
+    'save_otp': ("bigint, text, integer", """
+        UPDATE users
+        SET otp_code = $2,
+            otp_expiry = NOW() + make_interval(mins => $3),
+            updated_at = NOW()
+        WHERE telegram_id = $1
+    """),
+    'verify_otp': ("bigint, text", """
+        UPDATE users
+        SET is_email_verified = TRUE,
+            otp_code = NULL,
+            otp_expiry = NULL,
+            updated_at = NOW()
+        WHERE telegram_id = $1
+        AND otp_code = $2
+        AND otp_expiry > NOW()
+    """),
+    'deposit_funds': ("bigint, bigint", """
+        UPDATE accounts
+        SET balance = balance + $2,
+            available_balance = available_balance + $2,
+            total_deposits = total_deposits + $2,
+            updated_at = NOW()
+        WHERE user_telegram_id = $1
+    """),
+    'withdraw_funds': ("bigint, bigint", """
+        UPDATE accounts
+        SET balance = balance - $2,
+            available_balance = available_balance - $2,
+            total_withdrawals = total_withdrawals + $2,
+            updated_at = NOW()
+        WHERE user_telegram_id = $1
+        AND available_balance >= $2
+    """),
+    'lock_funds': ("bigint, bigint", """
+        UPDATE accounts
+        SET available_balance = available_balance - $2,
+            locked_balance = locked_balance + $2,
+            updated_at = NOW()
+        WHERE user_telegram_id = $1
+        AND available_balance >= $2
+    """),
+    'unlock_funds': ("bigint, bigint", """
+        UPDATE accounts
+        SET locked_balance = locked_balance - $2,
+            available_balance = available_balance + $2,
+            updated_at = NOW()
+        WHERE user_telegram_id = $1
+        AND locked_balance >= $2
+    """),
+}
+
+# Audit Log Batching
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 1.0  # seconds
+MEMORY_AUDIT_LOG_SIZE = 10_000  # entries kept by the in-memory backend
+
+# NULL marker for bulk COPY rows
+COPY_NULL = r'\N'
+
+# Admin Statistics
+ADMIN_STATS_REFRESH_INTERVAL = 300  # seconds
+
+# Update Processing
+MAX_CONCURRENT_UPDATES = 30  # matches Telegram's ~30 msg/s bot-wide send limit
+UPDATE_SHARDS = 16
+
+# Telegram HTTP Client
+TELEGRAM_POOL_SIZE = 256
+TELEGRAM_POOL_TIMEOUT = 30.0  # seconds to wait for a free connection
 
 # =========================
 # LOGGING
 # =========================
 
-logging.basicConfig(
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    level=logging.INFO,
-)
+# Records are queued by the caller and written to stderr by a listener
+# thread, keeping the write() syscall off the event loop.
+_log_queue = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+
+_log_enqueue = logging.handlers.QueueHandler(_log_queue)
+_log_enqueue.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(handlers=[_log_enqueue], level=logging.INFO)
+log_listener.start()
 logger = logging.getLogger(__name__)
 
+# =========================
+# MONEY HELPERS
+# =========================
+
+def to_cents(amount: Decimal) -> int:
+    """Convert a Decimal amount to integer cents"""
+    return int((amount * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+def from_cents(cents: int) -> Decimal:
+    """Convert integer cents to a 2-place Decimal amount"""
+    return Decimal(cents).scaleb(-2)
+
+def decode_money(row: Optional[Dict[str, Any]], fields: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+    """Convert the cents columns of a fetched row to Decimal amounts in place"""
+    if row is not None:
+        for field in fields:
+            if row.get(field) is not None:
+                row[field] = from_cents(row[field])
+    return row
+
+# =========================
+# DATABASE SCHEMA
+# =========================
+
+# All tables, created in one round-trip
+SCHEMA_DDL = """
+-- gen_random_bytes() for server-generated referral codes and plan IDs
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+-- Users table - Complete profile
+CREATE TABLE IF NOT EXISTS users (
+    telegram_id BIGINT PRIMARY KEY,
+    full_name VARCHAR(255) NOT NULL,
+    phone_number VARCHAR(20) NOT NULL,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    referral_code VARCHAR(20) UNIQUE,
+    referred_by BIGINT,
+    status VARCHAR(20) DEFAULT 'PENDING',
+    is_email_verified BOOLEAN DEFAULT FALSE,
+    otp_code VARCHAR(6),
+    otp_expiry TIMESTAMP WITH TIME ZONE,
+    registration_bonus_given BOOLEAN DEFAULT FALSE,
+    referral_bonus_given BOOLEAN DEFAULT FALSE,
+    last_activity TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Accounts table - Balances
+CREATE TABLE IF NOT EXISTS accounts (
+    id BIGSERIAL PRIMARY KEY,
+    user_telegram_id BIGINT UNIQUE REFERENCES users(telegram_id) ON DELETE CASCADE,
+    balance BIGINT DEFAULT 0,
+    locked_balance BIGINT DEFAULT 0,
+    available_balance BIGINT DEFAULT 0,
+    total_deposits BIGINT DEFAULT 0,
+    total_withdrawals BIGINT DEFAULT 0,
+    total_interest_earned BIGINT DEFAULT 0,
+    status VARCHAR(20) DEFAULT 'ACTIVE',
+    last_interest_calc TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Savings Plans Templates
+CREATE TABLE IF NOT EXISTS savings_plan_templates (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(50) NOT NULL,
+    description TEXT,
+    duration_days INTEGER NOT NULL,
+    min_amount DECIMAL(15,2) NOT NULL,
+    daily_rate DECIMAL(5,4) NOT NULL,
+    total_rate DECIMAL(5,2) NOT NULL,
+    is_locked BOOLEAN DEFAULT TRUE,
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- User Savings Plans
+CREATE TABLE IF NOT EXISTS user_savings_plans (
+    id BIGSERIAL PRIMARY KEY,
+    plan_id VARCHAR(50) UNIQUE NOT NULL,
+    user_telegram_id BIGINT REFERENCES users(telegram_id) ON DELETE CASCADE,
+    template_id INTEGER REFERENCES savings_plan_templates(id),
+    plan_name VARCHAR(50) NOT NULL,
+    principal_amount DECIMAL(15,2) NOT NULL,
+    current_value DECIMAL(15,2) DEFAULT 0.00,
+    interest_earned DECIMAL(15,2) DEFAULT 0.00,
+    daily_rate DECIMAL(5,4) NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    last_interest_calc TIMESTAMP WITH TIME ZONE,
+    status VARCHAR(20) DEFAULT 'ACTIVE',
+    is_locked BOOLEAN DEFAULT TRUE,
+    auto_renew BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Transactions table - Complete ledger
+CREATE TABLE IF NOT EXISTS transactions (
+    id BIGSERIAL PRIMARY KEY,
+    transaction_id VARCHAR(50) UNIQUE NOT NULL,
+    user_telegram_id BIGINT REFERENCES users(telegram_id) ON DELETE CASCADE,
+    type VARCHAR(30) NOT NULL,
+    method VARCHAR(20),
+    amount BIGINT NOT NULL,
+    fee BIGINT DEFAULT 0,
+    net_amount BIGINT,
+    status VARCHAR(20) DEFAULT 'PENDING',
+    crypto_address TEXT,
+    crypto_currency VARCHAR(10),
+    tx_hash VARCHAR(255),
+    user_reference TEXT,
+    reviewed_by BIGINT,
+    admin_note TEXT,
+    requested_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    reviewed_at TIMESTAMP WITH TIME ZONE,
+    completed_at TIMESTAMP WITH TIME ZONE,
+    metadata JSONB
+);
+
+-- Daily Interest Logs
+CREATE TABLE IF NOT EXISTS daily_interest_logs (
+    id BIGSERIAL PRIMARY KEY,
+    user_telegram_id BIGINT REFERENCES users(telegram_id),
+    savings_plan_id BIGINT REFERENCES user_savings_plans(id),
+    calculation_date DATE NOT NULL,
+    interest_amount DECIMAL(15,2) NOT NULL,
+    principal_amount DECIMAL(15,2) NOT NULL,
+    daily_rate DECIMAL(5,4) NOT NULL,
+    is_applied BOOLEAN DEFAULT FALSE,
+    applied_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Referrals table
+CREATE TABLE IF NOT EXISTS referrals (
+    id BIGSERIAL PRIMARY KEY,
+    referrer_id BIGINT REFERENCES users(telegram_id) ON DELETE CASCADE,
+    referred_id BIGINT UNIQUE REFERENCES users(telegram_id) ON DELETE CASCADE,
+    bonus_paid BOOLEAN DEFAULT FALSE,
+    bonus_amount BIGINT DEFAULT 100,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Audit logs - Complete audit trail
+CREATE TABLE IF NOT EXISTS audit_logs (
+    id BIGSERIAL PRIMARY KEY,
+    action VARCHAR(50) NOT NULL,
+    actor VARCHAR(20) NOT NULL,
+    actor_id BIGINT NOT NULL,
+    target_user BIGINT,
+    reference_id BIGINT,
+    description TEXT NOT NULL,
+    old_value TEXT,
+    new_value TEXT,
+    ip_address INET,
+    user_agent TEXT,
+    timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Admin panel totals, recomputed on a schedule (one row, key 'global')
+CREATE TABLE IF NOT EXISTS aggregated_stats (
+    key VARCHAR(20) PRIMARY KEY,
+    total_users INTEGER NOT NULL,
+    pending_users INTEGER NOT NULL,
+    approved_users INTEGER NOT NULL,
+    total_balance BIGINT NOT NULL,
+    pending_deposits INTEGER NOT NULL,
+    pending_withdrawals INTEGER NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Ledger amounts are BIGINT cents; convert columns left over from DECIMAL(15,2)
+DO $$
+DECLARE
+    col RECORD;
+BEGIN
+    FOR col IN
+        SELECT table_name, column_name FROM information_schema.columns
+        WHERE table_schema = 'public' AND data_type = 'numeric'
+        AND table_name IN ('accounts', 'transactions', 'referrals')
+    LOOP
+        EXECUTE format(
+            'ALTER TABLE %I ALTER COLUMN %I TYPE BIGINT USING round(%I * 100)::bigint',
+            col.table_name, col.column_name, col.column_name
+        );
+    END LOOP;
+    ALTER TABLE referrals ALTER COLUMN bonus_amount SET DEFAULT 100;
+END $$;
+
+-- Indexes for the hot lookup paths
+CREATE INDEX IF NOT EXISTS idx_users_created
+    ON users (created_at DESC, telegram_id DESC);
+CREATE INDEX IF NOT EXISTS idx_users_pending
+    ON users (created_at DESC)
+    WHERE status = 'PENDING' AND is_email_verified = TRUE;
+-- The UNIQUE user_telegram_id index already serves account lookups; a copy
+-- of the balance columns would block HOT updates on every balance change
+DROP INDEX IF EXISTS idx_accounts_user_cover;
+CREATE INDEX IF NOT EXISTS idx_transactions_user_requested
+    ON transactions (user_telegram_id, requested_at DESC);
+CREATE INDEX IF NOT EXISTS idx_transactions_pending_type
+    ON transactions (type, requested_at)
+    WHERE status = 'PENDING';
+
+-- Registration and referral bonuses plus the audit row for an approved user,
+-- applied once per user (guarded by registration_bonus_given); bonuses are in cents
+DROP FUNCTION IF EXISTS apply_signup_bonuses(BIGINT, BIGINT, NUMERIC, NUMERIC);
+CREATE OR REPLACE FUNCTION apply_signup_bonuses(
+    p_tid BIGINT, p_admin BIGINT, p_reg_bonus BIGINT, p_ref_bonus BIGINT
+) RETURNS VOID AS $$
+DECLARE
+    v_referrer BIGINT;
+BEGIN
+    UPDATE users
+    SET registration_bonus_given = TRUE
+    WHERE telegram_id = p_tid AND NOT registration_bonus_given
+    RETURNING referred_by INTO v_referrer;
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    UPDATE accounts
+    SET balance = balance + p_reg_bonus,
+        available_balance = available_balance + p_reg_bonus,
+        updated_at = NOW()
+    WHERE user_telegram_id = p_tid;
+
+    IF v_referrer IS NOT NULL THEN
+        UPDATE accounts
+        SET balance = balance + p_ref_bonus,
+            available_balance = available_balance + p_ref_bonus,
+            updated_at = NOW()
+        WHERE user_telegram_id = v_referrer;
+        IF FOUND THEN
+            INSERT INTO referrals (referrer_id, referred_id, bonus_paid, bonus_amount)
+            VALUES (v_referrer, p_tid, TRUE, p_ref_bonus)
+            ON CONFLICT (referred_id) DO NOTHING;
+            UPDATE users SET referral_bonus_given = TRUE WHERE telegram_id = p_tid;
+        END IF;
+    END IF;
+
+    INSERT INTO audit_logs (action, actor, actor_id, target_user, description)
+    VALUES ('USER_APPROVED', 'ADMIN', p_admin, p_tid,
+            format('User %s approved with $%s bonus', p_tid, (p_reg_bonus / 100.0)::numeric(15,2)));
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Lightweight rows for the admin and history listings (tuples instead of per-row dicts)
+PendingUserRow = namedtuple('PendingUserRow', 'telegram_id full_name email created_at')
+UserListRow = namedtuple('UserListRow', 'telegram_id full_name status created_at balance')
+TransactionHistoryRow = namedtuple('TransactionHistoryRow', 'transaction_id type amount method status requested_at')
+AdminOverview = namedtuple(
+    'AdminOverview',
+    'total_users pending_users approved_users total_balance pending_deposits pending_withdrawals'
+)
+
 # =========================
 # DATABASE MANAGER
 # =========================
 
+class PreparingConnection(PgConnection):
+    """psycopg2 connection that remembers which statements it has PREPAREd"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
 class DatabaseManager:
-    """Complete PostgreSQL database manager"""
+    """Storage facade; constructing it returns the Postgres or in-memory backend"""
     
-    def __init__(self):
-        self.conn = None
-        self.cursor = None
-        self.is_connected = False
-        self._connect()
-        self._init_tables()
-
-    def _connect(self):
-        """Establish database connection"""
+    is_connected = False
+    
+    def __new__(cls):
+        if cls is not DatabaseManager:
+            return super().__new__(cls)
+        
+        if not DATABASE_URL:
+            logger.warning("⚠️ DATABASE_URL not found. Running without persistent storage.")
+            return super().__new__(MemoryBackend)
+        
         try:
-            if DATABASE_URL:
-                self.conn = psycopg2.connect(DATABASE_URL, sslmode='require')
-                self.conn.autocommit = False
-                self.cursor = self.conn.cursor(cursor_factory=RealDictCursor)
-                self.is_connected = True
-                logger.info("✅ Database connected successfully")
+            pool = ThreadedConnectionPool(
+                DB_POOL_MIN + DB_POOL_RESERVED, DB_POOL_MAX + DB_POOL_RESERVED, DATABASE_URL,
+                sslmode='require', connection_factory=PreparingConnection
+            )
+        except Exception as e:
+            logger.error("❌ Database connection failed: %s", e)
+            return super().__new__(MemoryBackend)
+        
+        logger.info("✅ Database connected successfully")
+        backend = super().__new__(PostgresBackend)
+        backend.pool = pool
+        return backend
+
+    @contextmanager
+    def transaction(self):
+        """Group DB calls into one transaction (no-op without a database)"""
+        yield
+
+    def _invalidate_user(self, telegram_id: int):
+        """Drop a cached user row after it was written (no cache by default)"""
+
+    def _invalidate_account(self, telegram_id: Optional[int] = None):
+        """Drop a cached account row, or all of them, after a write (no cache by default)"""
+
+    def queue_audit(self, **entry):
+        """Record an audit entry without waiting for it to be stored"""
+        self.log_audit(**entry)
+
+    def refresh_admin_overview(self) -> bool:
+        """Recompute the stored admin totals (computed live without a database)"""
+        return True
+
+    # ========== SAVINGS INTEREST ==========
+
+    def calculate_and_add_interest(self, telegram_id: int) -> Decimal:
+        """Calculate and add interest for all user's active savings plans"""
+        total_interest = Decimal('0.00')
+        plans = self.get_user_savings_plans(telegram_id)
+        now = datetime.now(NY_TZ)
+        
+        for plan in plans:
+            if plan['status'] != 'ACTIVE':
+                continue
+            
+            last_calc = plan.get('last_interest_calc')
+            if last_calc:
+                last_calc = last_calc.replace(tzinfo=NY_TZ)
             else:
-                logger.warning("⚠️ DATABASE_URL not found. Running without persistent storage.")
-                self._init_memory_storage()
+                last_calc = plan['start_date']
+                if isinstance(last_calc, datetime):
+                    last_calc = last_calc.date()
+                last_calc = datetime.combine(last_calc, datetime.min.time()).replace(tzinfo=NY_TZ)
+            
+            days_diff = (now - last_calc).days
+            
+            if days_diff > 0:
+                # Interest is constant per day, so only the eligible day range matters
+                last_calc_date = last_calc.date()
+                first_day = max(last_calc_date + ONE_DAY, plan['start_date'])
+                last_day = min(last_calc_date + ONE_DAY * days_diff, plan['end_date'])
+                eligible_days = (last_day - first_day).days + 1
+                if eligible_days > 0:
+                    plan_interest = plan['principal_amount'] * plan['daily_rate'] * eligible_days
+                    plan['interest_earned'] += plan_interest
+                    plan['current_value'] += plan_interest
+                    total_interest += plan_interest
+                # Advance by whole days so the next run starts where this one stopped
+                plan['last_interest_calc'] = last_calc + ONE_DAY * days_diff
+        
+        return total_interest
+
+    def apply_pending_interest_and_fetch(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+        """Apply pending savings interest and return the up-to-date account"""
+        self.apply_pending_interest(telegram_id)
+        return self.get_account(telegram_id)
+
+    # ========== COMPOSITE OPERATIONS ==========
+
+    def open_savings_plan(self, telegram_id: int, template: Dict[str, Any], amount: Decimal) -> Optional[str]:
+        """Lock funds, create the plan and record it in one transaction"""
+        try:
+            with self.transaction():
+                if not self.lock_funds(telegram_id, amount):
+                    raise RuntimeError("insufficient available balance")
+                plan_id = self.create_savings_plan(
+                    telegram_id=telegram_id,
+                    template_id=template['id'],
+                    plan_name=template['name'],
+                    principal_amount=amount,
+                    daily_rate=template['daily_rate'],
+                    duration_days=template['duration_days'],
+                    is_locked=template['is_locked']
+                )
+                if not plan_id:
+                    raise RuntimeError("savings plan not created")
+                if not self.create_transaction(
+                    telegram_id=telegram_id,
+                    tx_type='SAVINGS_CREATED',
+                    amount=amount,
+                    method='SAVINGS_PLAN'
+                ):
+                    raise RuntimeError("transaction record not written")
+                if not self.log_audit(
+                    action='SAVINGS_CREATED',
+                    actor='USER',
+                    actor_id=telegram_id,
+                    description=f"Created {template['name']} savings plan with ${amount}"
+                ):
+                    raise RuntimeError("audit entry not written")
+            self._invalidate_account(telegram_id)
+            return plan_id
         except Exception as e:
-            logger.error(f"❌ Database connection failed: {e}")
-            self._init_memory_storage()
+            logger.error("Error opening savings plan: %s", e)
+            return None
 
-    def _init_memory_storage(self):
-        """Initialize in-memory storage for development"""
-        self.users = {}
-        self.accounts = {}
-        self.transactions = []
-        self.savings_plans = []
-        self.audit_logs = []
-        self.referrals = {}
-        self.is_connected = False
-        logger.info("📁 Using in-memory storage (development mode)")
+    def close(self):
+        """Release storage resources"""
+
+class PostgresBackend(DatabaseManager):
+    """PostgreSQL storage backend over a psycopg2 connection pool"""
+    
+    is_connected = True
+    
+    # Set once the schema has been verified, so later instances skip the probe
+    _schema_ready = False
+    
+    def __init__(self):
+        self._user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+        self._user_cache_lock = threading.Lock()
+        self._account_cache = TTLCache(maxsize=ACCOUNT_CACHE_SIZE, ttl=ACCOUNT_CACHE_TTL)
+        self._account_cache_lock = threading.Lock()
+        self._template_cache = TTLCache(maxsize=1, ttl=TEMPLATE_CACHE_TTL)
+        self._template_cache_lock = threading.Lock()
+        self._local = threading.local()
+        self._init_tables()
+        
+        # Standalone audit entries are COPYed in batches by a writer thread
+        self._audit_queue = queue.SimpleQueue()
+        self._audit_thread = threading.Thread(target=self._audit_writer, name="audit-writer", daemon=True)
+        self._audit_thread.start()
+
+    @contextmanager
+    def _cursor(self, cursor_factory=RealDictCursor):
+        """Check out a pooled connection and yield a cursor, committing on success"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            # Inside transaction(): share its connection and leave the commit to it
+            with conn.cursor(cursor_factory=cursor_factory) as cur:
+                yield cur
+            return
+        
+        conn = self.pool.getconn()
+        try:
+            with conn.cursor(cursor_factory=cursor_factory) as cur:
+                yield cur
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self.pool.putconn(conn)
+
+    @contextmanager
+    def transaction(self):
+        """Run the DB calls made on this thread inside one transaction"""
+        if getattr(self._local, 'conn', None) is not None:
+            yield
+            return
+        
+        conn = self.pool.getconn()
+        self._local.conn = conn
+        try:
+            yield
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self.pool.putconn(conn)
 
     def _init_tables(self):
         """Create all necessary tables with complete schema"""
-        if not self.is_connected:
+        if PostgresBackend._schema_ready:
             return
 
         try:
-            # Users table - Complete profile
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    telegram_id BIGINT PRIMARY KEY,
-                    full_name VARCHAR(255) NOT NULL,
-                    phone_number VARCHAR(20) NOT NULL,
-                    email VARCHAR(255) UNIQUE NOT NULL,
-                    password_hash VARCHAR(255) NOT NULL,
-                    referral_code VARCHAR(20) UNIQUE,
-                    referred_by BIGINT,
-                    status VARCHAR(20) DEFAULT 'PENDING',
-                    is_email_verified BOOLEAN DEFAULT FALSE,
-                    otp_code VARCHAR(6),
-                    otp_expiry TIMESTAMP WITH TIME ZONE,
-                    registration_bonus_given BOOLEAN DEFAULT FALSE,
-                    referral_bonus_given BOOLEAN DEFAULT FALSE,
-                    last_activity TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-                )
-            """)
-
-            # Accounts table - Balances
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS accounts (
-                    id BIGSERIAL PRIMARY KEY,
-                    user_telegram_id BIGINT UNIQUE REFERENCES users(telegram_id) ON DELETE CASCADE,
-                    balance DECIMAL(15,2) DEFAULT 0.00,
-                    locked_balance DECIMAL(15,2) DEFAULT 0.00,
-                    available_balance DECIMAL(15,2) DEFAULT 0.00,
-                    total_deposits DECIMAL(15,2) DEFAULT 0.00,
-                    total_withdrawals DECIMAL(15,2) DEFAULT 0.00,
-                    total_interest_earned DECIMAL(15,2) DEFAULT 0.00,
-                    status VARCHAR(20) DEFAULT 'ACTIVE',
-                    last_interest_calc TIMESTAMP WITH TIME ZONE,
-                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-                )
-            """)
-
-            # Savings Plans Templates
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS savings_plan_templates (
-                    id SERIAL PRIMARY KEY,
-                    name VARCHAR(50) NOT NULL,
-                    description TEXT,
-                    duration_days INTEGER NOT NULL,
-                    min_amount DECIMAL(15,2) NOT NULL,
-                    daily_rate DECIMAL(5,4) NOT NULL,
-                    total_rate DECIMAL(5,2) NOT NULL,
-                    is_locked BOOLEAN DEFAULT TRUE,
-                    is_active BOOLEAN DEFAULT TRUE,
-                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-                )
-            """)
-
-            # User Savings Plans
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS user_savings_plans (
-                    id BIGSERIAL PRIMARY KEY,
-                    plan_id VARCHAR(50) UNIQUE NOT NULL,
-                    user_telegram_id BIGINT REFERENCES users(telegram_id) ON DELETE CASCADE,
-                    template_id INTEGER REFERENCES savings_plan_templates(id),
-                    plan_name VARCHAR(50) NOT NULL,
-                    principal_amount DECIMAL(15,2) NOT NULL,
-                    current_value DECIMAL(15,2) DEFAULT 0.00,
-                    interest_earned DECIMAL(15,2) DEFAULT 0.00,
-                    daily_rate DECIMAL(5,4) NOT NULL,
-                    start_date DATE NOT NULL,
-                    end_date DATE NOT NULL,
-                    last_interest_calc TIMESTAMP WITH TIME ZONE,
-                    status VARCHAR(20) DEFAULT 'ACTIVE',
-                    is_locked BOOLEAN DEFAULT TRUE,
-                    auto_renew BOOLEAN DEFAULT FALSE,
-                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-                )
-            """)
-
-            # Transactions table - Complete ledger
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS transactions (
-                    id BIGSERIAL PRIMARY KEY,
-                    transaction_id VARCHAR(50) UNIQUE NOT NULL,
-                    user_telegram_id BIGINT REFERENCES users(telegram_id) ON DELETE CASCADE,
-                    type VARCHAR(30) NOT NULL,
-                    method VARCHAR(20),
-                    amount DECIMAL(15,2) NOT NULL,
-                    fee DECIMAL(15,2) DEFAULT 0.00,
-                    net_amount DECIMAL(15,2),
-                    status VARCHAR(20) DEFAULT 'PENDING',
-                    crypto_address TEXT,
-                    crypto_currency VARCHAR(10),
-                    tx_hash VARCHAR(255),
-                    user_reference TEXT,
-                    reviewed_by BIGINT,
-                    admin_note TEXT,
-                    requested_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                    reviewed_at TIMESTAMP WITH TIME ZONE,
-                    completed_at TIMESTAMP WITH TIME ZONE,
-                    metadata JSONB
-                )
-            """)
-
-            # Daily Interest Logs
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS daily_interest_logs (
-                    id BIGSERIAL PRIMARY KEY,
-                    user_telegram_id BIGINT REFERENCES users(telegram_id),
-                    savings_plan_id BIGINT REFERENCES user_savings_plans(id),
-                    calculation_date DATE NOT NULL,
-                    interest_amount DECIMAL(15,2) NOT NULL,
-                    principal_amount DECIMAL(15,2) NOT NULL,
-                    daily_rate DECIMAL(5,4) NOT NULL,
-                    is_applied BOOLEAN DEFAULT FALSE,
-                    applied_at TIMESTAMP WITH TIME ZONE,
-                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-                )
-            """)
-
-            # Referrals table
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS referrals (
-                    id BIGSERIAL PRIMARY KEY,
-                    referrer_id BIGINT REFERENCES users(telegram_id) ON DELETE CASCADE,
-                    referred_id BIGINT UNIQUE REFERENCES users(telegram_id) ON DELETE CASCADE,
-                    bonus_paid BOOLEAN DEFAULT FALSE,
-                    bonus_amount DECIMAL(15,2) DEFAULT 1.00,
-                    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+            # bulk_load() below joins this transaction via the thread's connection
+            with self.transaction(), self._cursor() as cur:
+                # One round-trip when the current schema is already in place
+                cur.execute(
+                    "SELECT obj_description(to_regclass('public.users'), 'pg_class') = %s AS ready",
+                    (SCHEMA_VERSION,)
                 )
-            """)
-
-            # Audit logs - Complete audit trail
-            self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS audit_logs (
-                    id BIGSERIAL PRIMARY KEY,
-                    action VARCHAR(50) NOT NULL,
-                    actor VARCHAR(20) NOT NULL,
-                    actor_id BIGINT NOT NULL,
-                    target_user BIGINT,
-                    reference_id BIGINT,
-                    description TEXT NOT NULL,
-                    old_value TEXT,
-                    new_value TEXT,
-                    ip_address INET,
-                    user_agent TEXT,
-                    timestamp TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-                )
-            """)
+                if cur.fetchone()['ready']:
+                    PostgresBackend._schema_ready = True
+                    return
+
+                cur.execute(SCHEMA_DDL)
 
-            # Seed savings plan templates if empty
-            self.cursor.execute("SELECT COUNT(*) as count FROM savings_plan_templates")
-            count = self.cursor.fetchone()['count']
+                # Seed savings plan templates if empty
+                cur.execute("SELECT COUNT(*) as count FROM savings_plan_templates")
+                count = cur.fetchone()['count']
             
-            if count == 0:
-                plans = [
-                    ('Basic', '24-hour savings plan with daily interest', 1, 100.00, 0.01, 1.0, False),
-                    ('Silver', '7-day savings plan with locked principal', 7, 1000.00, 0.012, 8.4, True),
-                    ('Gold', '15-day premium savings plan', 15, 5000.00, 0.014, 21.0, True),
-                    ('Platinum', '30-day premium savings plan', 30, 10000.00, 0.016, 48.0, True),
-                    ('Diamond', '90-day premium savings plan', 90, 25000.00, 0.017, 153.0, True)
-                ]
+                if count == 0:
+                    plans = [
+                        ('Basic', '24-hour savings plan with daily interest', 1, 100.00, 0.01, 1.0, False),
+                        ('Silver', '7-day savings plan with locked principal', 7, 1000.00, 0.012, 8.4, True),
+                        ('Gold', '15-day premium savings plan', 15, 5000.00, 0.014, 21.0, True),
+                        ('Platinum', '30-day premium savings plan', 30, 10000.00, 0.016, 48.0, True),
+                        ('Diamond', '90-day premium savings plan', 90, 25000.00, 0.017, 153.0, True)
+                    ]
                 
-                for plan in plans:
-                    self.cursor.execute("""
-                        INSERT INTO savings_plan_templates 
-                        (name, description, duration_days, min_amount, daily_rate, total_rate, is_locked)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """, plan)
+                    self.bulk_load(
+                        'savings_plan_templates', plans,
+                        ('name', 'description', 'duration_days', 'min_amount',
+                         'daily_rate', 'total_rate', 'is_locked')
+                    )
                 
-                self.conn.commit()
-                logger.info("✅ Savings plan templates seeded")
+                    logger.info("✅ Savings plan templates seeded")
 
-            self.conn.commit()
+                cur.execute("ANALYZE")
+
+                cur.execute("COMMENT ON TABLE users IS %s", (SCHEMA_VERSION,))
+
+            PostgresBackend._schema_ready = True
             logger.info("✅ All database tables initialized successfully")
 
         except Exception as e:
-            logger.error(f"❌ Database initialization failed: {e}")
-            self.conn.rollback()
+            logger.error("❌ Database initialization failed: %s", e)
+
+    def bulk_load(self, table: str, rows: List[tuple], columns: Tuple[str, ...]):
+        """COPY rows into a table in one round-trip (for seeds and data migrations)"""
+        # COPY reads an unquoted empty field as NULL, so NULLs get an explicit
+        # marker and empty strings stay empty strings
+        buf = io.StringIO()
+        csv.writer(buf).writerows(
+            tuple(COPY_NULL if value is None else value for value in row) for row in rows
+        )
+        buf.seek(0)
+        copy = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv, NULL {})").format(
+            sql.Identifier(table),
+            sql.SQL(", ").join(map(sql.Identifier, columns)),
+            sql.Literal(COPY_NULL)
+        )
+        with self._cursor() as cur:
+            cur.copy_expert(copy, buf)
+
+    def _skip_commit_fsync(self, cur):
+        """Commit a standalone low-value write without waiting for the WAL flush"""
+        # Never inside transaction(): it would relax the financial writes too
+        if getattr(self._local, 'conn', None) is None:
+            cur.execute("SET LOCAL synchronous_commit TO OFF")
+
+    def _execute_prepared(self, cur, name: str, params: tuple):
+        """Run a hot-path query via EXECUTE, preparing it on first use per connection"""
+        conn = cur.connection
+        if name not in conn.prepared:
+            arg_types, statement = PREPARED_STATEMENTS[name]
+            signature = f" ({arg_types})" if arg_types else ""
+            cur.execute(f"PREPARE {name}{signature} AS {statement}")
+            conn.prepared.add(name)
+        if params:
+            placeholders = ", ".join(["%s"] * len(params))
+            cur.execute(f"EXECUTE {name} ({placeholders})", params)
+        else:
+            cur.execute(f"EXECUTE {name}")
 
     # ========== USER OPERATIONS ==========
 
+    def _invalidate_user(self, telegram_id: int):
+        """Drop a cached user row after it was written"""
+        with self._user_cache_lock:
+            self._user_cache.pop(telegram_id, None)
+
     def get_user(self, telegram_id: int) -> Optional[Dict[str, Any]]:
         """Get user by Telegram ID"""
-        if not self.is_connected:
-            return self.users.get(str(telegram_id))
+        with self._user_cache_lock:
+            user = self._user_cache.get(telegram_id)
+        if user is not None:
+            return user
         
         try:
-            self.cursor.execute("SELECT * FROM users WHERE telegram_id = %s", (telegram_id,))
-            return self.cursor.fetchone()
+            with self._cursor() as cur:
+                self._execute_prepared(cur, 'get_user', (telegram_id,))
+                user = cur.fetchone()
         except Exception as e:
-            logger.error(f"Error getting user: {e}")
+            logger.error("Error getting user: %s", e)
             return None
+        
+        if user is not None:
+            with self._user_cache_lock:
+                self._user_cache[telegram_id] = user
+        return user
 
     def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Get user by email"""
-        if not self.is_connected:
-            for user in self.users.values():
-                if user.get('email') == email:
-                    return user
-            return None
-        
         try:
-            self.cursor.execute("SELECT * FROM users WHERE email = %s", (email,))
-            return self.cursor.fetchone()
+            with self._cursor() as cur:
+                self._execute_prepared(cur, 'get_user_by_email', (email,))
+                return cur.fetchone()
         except Exception as e:
-            logger.error(f"Error getting user by email: {e}")
+            logger.error("Error getting user by email: %s", e)
             return None
 
+    def email_exists(self, email: str) -> bool:
+        """Check whether an email is already registered"""
+        try:
+            with self._cursor() as cur:
+                self._execute_prepared(cur, 'email_exists', (email,))
+                return cur.fetchone() is not None
+        except Exception as e:
+            logger.error("Error checking email: %s", e)
+            return False
+
     def get_user_by_referral(self, referral_code: str) -> Optional[Dict[str, Any]]:
         """Get user by referral code"""
-        if not self.is_connected:
-            for user in self.users.values():
-                if user.get('referral_code') == referral_code:
-                    return user
-            return None
-        
         try:
-            self.cursor.execute("SELECT * FROM users WHERE referral_code = %s", (referral_code,))
-            return self.cursor.fetchone()
+            with self._cursor() as cur:
+                self._execute_prepared(cur, 'get_user_by_referral', (referral_code,))
+                return cur.fetchone()
         except Exception as e:
-            logger.error(f"Error getting user by referral: {e}")
+            logger.error("Error getting user by referral: %s", e)
             return None
 
     def create_user(self, telegram_id: int, full_name: str, phone: str, email: str, 
                    password_hash: str, referred_by: Optional[str] = None) -> bool:
         """Create new user"""
-        if not self.is_connected:
-            user_id = str(telegram_id)
-            if user_id in self.users:
-                return False
-            
-            ref_code = f"REF{secrets.token_hex(4).upper()}"
-            
-            self.users[user_id] = {
-                'telegram_id': telegram_id,
-                'full_name': full_name,
-                'phone_number': phone,
-                'email': email,
-                'password_hash': password_hash,
-                'referral_code': ref_code,
-                'referred_by': referred_by,
-                'status': 'PENDING',
-                'is_email_verified': False,
-                'created_at': datetime.now()
-            }
-            
-            # Create account
-            self.accounts[user_id] = {
-                'user_telegram_id': telegram_id,
-                'balance': Decimal('0.00'),
-                'locked_balance': Decimal('0.00'),
-                'available_balance': Decimal('0.00'),
-                'total_deposits': Decimal('0.00'),
-                'total_withdrawals': Decimal('0.00'),
-                'total_interest_earned': Decimal('0.00'),
-                'status': 'ACTIVE',
-                'created_at': datetime.now()
-            }
-            
-            return True
-        
         try:
-            # Generate unique referral code
-            ref_code = f"REF{secrets.token_hex(4).upper()}"
-            
-            self.cursor.execute("""
-                INSERT INTO users 
-                (telegram_id, full_name, phone_number, email, password_hash, 
-                 referral_code, referred_by, status, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, 'PENDING', NOW(), NOW())
-                RETURNING telegram_id
-            """, (telegram_id, full_name, phone, email, password_hash, ref_code, referred_by))
-            
-            # Create account for user
-            self.cursor.execute("""
-                INSERT INTO accounts 
-                (user_telegram_id, balance, locked_balance, available_balance, 
-                 total_deposits, total_withdrawals, total_interest_earned, status, created_at, updated_at)
-                VALUES (%s, 0.00, 0.00, 0.00, 0.00, 0.00, 0.00, 'ACTIVE', NOW(), NOW())
-            """, (telegram_id,))
+            with self._cursor() as cur:
+                # Create the user and their account in one statement; the referral
+                # code is generated server-side and regenerated on a collision
+                for _ in range(GENERATED_ID_ATTEMPTS):
+                    cur.execute("""
+                        WITH new_user AS (
+                            INSERT INTO users 
+                            (telegram_id, full_name, phone_number, email, password_hash, 
+                             referral_code, referred_by, status, created_at, updated_at)
+                            VALUES (%s, %s, %s, %s, %s, 
+                                    'REF' || upper(encode(gen_random_bytes(4), 'hex')), 
+                                    %s, 'PENDING', NOW(), NOW())
+                            ON CONFLICT (referral_code) DO NOTHING
+                            RETURNING telegram_id
+                        )
+                        INSERT INTO accounts 
+                        (user_telegram_id, balance, locked_balance, available_balance, 
+                         total_deposits, total_withdrawals, total_interest_earned, status, created_at, updated_at)
+                        SELECT telegram_id, 0, 0, 0, 0, 0, 0, 'ACTIVE', NOW(), NOW()
+                        FROM new_user
+                    """, (telegram_id, full_name, phone, email, password_hash, referred_by))
+                    if cur.rowcount > 0:
+                        break
+                else:
+                    logger.error("Error creating user: no free referral code for %s", telegram_id)
+                    return False
             
-            self.conn.commit()
-            logger.info(f"✅ User {telegram_id} created successfully")
+            self._invalidate_user(telegram_id)
+            logger.info("✅ User %s created successfully", telegram_id)
             return True
             
         except Exception as e:
-            logger.error(f"Error creating user: {e}")
-            self.conn.rollback()
+            logger.error("Error creating user: %s", e)
             return False
 
     def save_otp(self, telegram_id: int, otp_code: str) -> bool:
         """Save OTP for user"""
-        if not self.is_connected:
-            user_id = str(telegram_id)
-            if user_id in self.users:
-                self.users[user_id]['otp_code'] = otp_code
-                self.users[user_id]['otp_expiry'] = datetime.now() + timedelta(minutes=OTP_EXPIRY_MINUTES)
-                return True
-            return False
-        
         try:
-            expiry = datetime.now() + timedelta(minutes=OTP_EXPIRY_MINUTES)
-            self.cursor.execute("""
-                UPDATE users 
-                SET otp_code = %s, otp_expiry = %s, updated_at = NOW()
-                WHERE telegram_id = %s
-            """, (otp_code, expiry, telegram_id))
-            self.conn.commit()
-            return self.cursor.rowcount > 0
+            with self._cursor() as cur:
+                # A lost OTP is simply re-requested
+                self._skip_commit_fsync(cur)
+                self._execute_prepared(cur, 'save_otp', (telegram_id, otp_code, OTP_EXPIRY_MINUTES))
+                updated = cur.rowcount > 0
+            self._invalidate_user(telegram_id)
+            return updated
         except Exception as e:
-            logger.error(f"Error saving OTP: {e}")
-            self.conn.rollback()
+            logger.error("Error saving OTP: %s", e)
             return False
 
     def verify_otp(self, telegram_id: int, otp_code: str) -> Tuple[bool, str]:
         """Verify OTP code"""
-        if not self.is_connected:
-            user_id = str(telegram_id)
-            if user_id not in self.users:
-                return False, "User not found"
-            
-            user = self.users[user_id]
-            if not user.get('otp_code'):
-                return False, "No OTP found"
-            
-            if user['otp_code'] != otp_code:
-                return False, "Invalid OTP"
-            
-            if datetime.now() > user.get('otp_expiry', datetime.now()):
-                return False, "OTP expired"
-            
-            user['is_email_verified'] = True
-            user['otp_code'] = None
-            user['otp_expiry'] = None
-            return True, "Email verified"
-        
         try:
-            self.cursor.execute("""
-                SELECT otp_code, otp_expiry FROM users 
-                WHERE telegram_id = %s
-            """, (telegram_id,))
-            user = self.cursor.fetchone()
-            
-            if not user:
-                return False, "User not found"
-            
-            if not user['otp_code']:
-                return False, "No OTP found"
+            with self._cursor() as cur:
+                self._execute_prepared(cur, 'verify_otp', (telegram_id, otp_code))
             
-            if user['otp_code'] != otp_code:
-                return False, "Invalid OTP"
+                if cur.rowcount == 0:
+                    # Only the failure path pays for a second query, to pick the message
+                    cur.execute("""
+                        SELECT otp_code IS NULL AS no_otp, otp_expiry <= NOW() AS expired 
+                        FROM users 
+                        WHERE telegram_id = %s
+                    """, (telegram_id,))
+                    user = cur.fetchone()
             
-            if datetime.now() > user['otp_expiry']:
-                return False, "OTP expired"
-            
-            self.cursor.execute("""
-                UPDATE users 
-                SET is_email_verified = TRUE, 
-                    otp_code = NULL, 
-                    otp_expiry = NULL,
-                    updated_at = NOW()
-                WHERE telegram_id = %s
-            """, (telegram_id,))
-            self.conn.commit()
+                    if not user:
+                        return False, "User not found"
+                    if user['no_otp']:
+                        return False, "No OTP found"
+                    if user['expired']:
+                        return False, "OTP expired"
+                    return False, "Invalid OTP"
+            self._invalidate_user(telegram_id)
             
             return True, "Email verified successfully"
             
         except Exception as e:
-            logger.error(f"Error verifying OTP: {e}")
+            logger.error("Error verifying OTP: %s", e)
             return False, f"Error: {str(e)}"
 
     def update_user_status(self, telegram_id: int, status: str) -> bool:
         """Update user status"""
-        if not self.is_connected:
-            user_id = str(telegram_id)
-            if user_id in self.users:
-                self.users[user_id]['status'] = status
-                return True
-            return False
-        
         try:
-            self.cursor.execute("""
-                UPDATE users 
-                SET status = %s, updated_at = NOW() 
-                WHERE telegram_id = %s
-            """, (status, telegram_id))
-            self.conn.commit()
-            return self.cursor.rowcount > 0
+            with self._cursor() as cur:
+                cur.execute("""
+                    UPDATE users 
+                    SET status = %s, updated_at = NOW() 
+                    WHERE telegram_id = %s
+                """, (status, telegram_id))
+                updated = cur.rowcount > 0
+            self._invalidate_user(telegram_id)
+            return updated
         except Exception as e:
-            logger.error(f"Error updating user status: {e}")
-            self.conn.rollback()
+            logger.error("Error updating user status: %s", e)
             return False
 
-    def get_pending_users(self) -> List[Dict[str, Any]]:
+    def get_pending_users(self) -> List[PendingUserRow]:
         """Get all pending users (email verified)"""
-        if not self.is_connected:
-            return [u for u in self.users.values() if u['status'] == 'PENDING' and u.get('is_email_verified')]
-        
         try:
-            self.cursor.execute("""
-                SELECT * FROM users 
-                WHERE status = 'PENDING' 
-                AND is_email_verified = TRUE 
-                ORDER BY created_at DESC
-            """)
-            return self.cursor.fetchall()
+            with self._cursor(cursor_factory=None) as cur:
+                cur.execute("""
+                    SELECT telegram_id, full_name, email, created_at FROM users 
+                    WHERE status = 'PENDING' 
+                    AND is_email_verified = TRUE 
+                    ORDER BY created_at DESC
+                """)
+                return [PendingUserRow._make(row) for row in cur.fetchall()]
         except Exception as e:
-            logger.error(f"Error getting pending users: {e}")
+            logger.error("Error getting pending users: %s", e)
             return []
 
-    def get_all_users(self) -> List[Dict[str, Any]]:
-        """Get all users (admin only)"""
-        if not self.is_connected:
-            return list(self.users.values())
-        
+    def get_all_users(self, limit: int = ADMIN_USERS_PAGE_SIZE,
+                      after: Optional[Tuple[datetime, int]] = None) -> List[UserListRow]:
+        """Get a page of users, newest first, following an (created_at, telegram_id) cursor (admin only)"""
+        after_ts, after_id = after if after else (None, None)
         try:
-            self.cursor.execute("""
-                SELECT u.*, a.balance, a.available_balance, a.total_deposits, a.total_withdrawals 
-                FROM users u
-                LEFT JOIN accounts a ON u.telegram_id = a.user_telegram_id
-                ORDER BY u.created_at DESC
-            """)
-            return self.cursor.fetchall()
+            with self._cursor(cursor_factory=None) as cur:
+                cur.execute("""
+                    SELECT u.telegram_id, u.full_name, u.status, u.created_at, a.balance 
+                    FROM users u
+                    LEFT JOIN accounts a ON u.telegram_id = a.user_telegram_id
+                    WHERE %(after_ts)s IS NULL
+                    OR (u.created_at, u.telegram_id) < (%(after_ts)s, %(after_id)s)
+                    ORDER BY u.created_at DESC, u.telegram_id DESC
+                    LIMIT %(limit)s
+                """, {'after_ts': after_ts, 'after_id': after_id, 'limit': limit})
+                return [
+                    UserListRow(*row[:4], from_cents(row[4]) if row[4] is not None else None)
+                    for row in cur.fetchall()
+                ]
         except Exception as e:
-            logger.error(f"Error getting all users: {e}")
+            logger.error("Error getting all users: %s", e)
             return []
 
-    # ========== ACCOUNT OPERATIONS ==========
+    def count_users(self) -> int:
+        """Count all registered users"""
+        try:
+            with self._cursor(cursor_factory=None) as cur:
+                cur.execute("SELECT COUNT(*) FROM users")
+                return cur.fetchone()[0]
+        except Exception as e:
+            logger.error("Error counting users: %s", e)
+            return 0
 
-    def get_account(self, telegram_id: int) -> Optional[Dict[str, Any]]:
-        """Get account by user ID"""
-        if not self.is_connected:
-            return self.accounts.get(str(telegram_id))
-        
+    def get_user_with_account(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+        """Get a user row together with its account balances in one query"""
         try:
-            self.cursor.execute("SELECT * FROM accounts WHERE user_telegram_id = %s", (telegram_id,))
-            return self.cursor.fetchone()
+            with self._cursor() as cur:
+                cur.execute("""
+                    SELECT u.*, a.balance, a.available_balance, a.locked_balance
+                    FROM users u
+                    LEFT JOIN accounts a ON u.telegram_id = a.user_telegram_id
+                    WHERE u.telegram_id = %s
+                """, (telegram_id,))
+                return decode_money(cur.fetchone(), USER_BALANCE_FIELDS)
         except Exception as e:
-            logger.error(f"Error getting account: {e}")
+            logger.error("Error getting user with account: %s", e)
             return None
 
-    def add_registration_bonus(self, telegram_id: int) -> bool:
-        """Add registration bonus to user"""
-        if not self.is_connected:
-            user_id = str(telegram_id)
-            if user_id in self.accounts:
-                self.accounts[user_id]['balance'] += REGISTRATION_BONUS
-                self.accounts[user_id]['available_balance'] += REGISTRATION_BONUS
+    def refresh_admin_overview(self) -> bool:
+        """Recompute the admin totals into aggregated_stats"""
+        try:
+            with self._cursor() as cur:
+                cur.execute("""
+                    INSERT INTO aggregated_stats 
+                    (key, total_users, pending_users, approved_users, total_balance,
+                     pending_deposits, pending_withdrawals, updated_at)
+                    SELECT 'global',
+                           COUNT(*),
+                           COUNT(*) FILTER (WHERE u.status = 'PENDING'),
+                           COUNT(*) FILTER (WHERE u.status = 'APPROVED'),
+                           COALESCE(SUM(a.balance), 0),
+                           (SELECT COUNT(*) FROM transactions
+                            WHERE status = 'PENDING' AND type = 'DEPOSIT'),
+                           (SELECT COUNT(*) FROM transactions
+                            WHERE status = 'PENDING' AND type = 'WITHDRAW'),
+                           NOW()
+                    FROM users u
+                    LEFT JOIN accounts a ON u.telegram_id = a.user_telegram_id
+                    ON CONFLICT (key) DO UPDATE SET
+                        total_users = EXCLUDED.total_users,
+                        pending_users = EXCLUDED.pending_users,
+                        approved_users = EXCLUDED.approved_users,
+                        total_balance = EXCLUDED.total_balance,
+                        pending_deposits = EXCLUDED.pending_deposits,
+                        pending_withdrawals = EXCLUDED.pending_withdrawals,
+                        updated_at = EXCLUDED.updated_at
+                """)
                 return True
+        except Exception as e:
+            logger.error("Error refreshing admin overview: %s", e)
             return False
-        
+
+    def get_admin_overview(self) -> Optional[AdminOverview]:
+        """Get the stored user, balance and pending transaction totals"""
         try:
-            self.cursor.execute("""
-                UPDATE accounts 
-                SET balance = balance + %s,
-                    available_balance = available_balance + %s,
-                    updated_at = NOW()
-                WHERE user_telegram_id = %s
-            """, (REGISTRATION_BONUS, REGISTRATION_BONUS, telegram_id))
-            self.conn.commit()
-            return self.cursor.rowcount > 0
+            for _ in range(2):
+                with self._cursor(cursor_factory=None) as cur:
+                    cur.execute("""
+                        SELECT total_users, pending_users, approved_users, total_balance,
+                               pending_deposits, pending_withdrawals
+                        FROM aggregated_stats 
+                        WHERE key = 'global'
+                    """)
+                    row = cur.fetchone()
+                if row:
+                    return AdminOverview(*row[:3], from_cents(row[3]), *row[4:])
+                # First read after a fresh schema: compute the row now
+                if not self.refresh_admin_overview():
+                    return None
+            return None
         except Exception as e:
-            logger.error(f"Error adding bonus: {e}")
-            self.conn.rollback()
-            return False
+            logger.error("Error getting admin overview: %s", e)
+            return None
 
-    def add_referral_bonus(self, referrer_id: int) -> bool:
-        """Add referral bonus to referrer"""
-        if not self.is_connected:
-            user_id = str(referrer_id)
-            if user_id in self.accounts:
-                self.accounts[user_id]['balance'] += REFERRAL_BONUS
-                self.accounts[user_id]['available_balance'] += REFERRAL_BONUS
-                return True
-            return False
+    # ========== ACCOUNT OPERATIONS ==========
+
+    def _invalidate_account(self, telegram_id: Optional[int] = None):
+        """Drop a cached account row, or all of them, after a write"""
+        with self._account_cache_lock:
+            if telegram_id is None:
+                self._account_cache.clear()
+            else:
+                self._account_cache.pop(telegram_id, None)
+
+    def _cache_account(self, telegram_id: int, account: Optional[Dict[str, Any]]):
+        """Remember a freshly read account row"""
+        if account is not None:
+            with self._account_cache_lock:
+                self._account_cache[telegram_id] = account
+
+    def get_account(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+        """Get account by user ID"""
+        with self._account_cache_lock:
+            account = self._account_cache.get(telegram_id)
+        if account is not None:
+            return account
         
         try:
-            self.cursor.execute("""
-                UPDATE accounts 
-                SET balance = balance + %s,
-                    available_balance = available_balance + %s,
-                    updated_at = NOW()
-                WHERE user_telegram_id = %s
-            """, (REFERRAL_BONUS, REFERRAL_BONUS, referrer_id))
-            self.conn.commit()
-            return self.cursor.rowcount > 0
+            with self._cursor() as cur:
+                self._execute_prepared(cur, 'get_account', (telegram_id,))
+                account = decode_money(cur.fetchone(), ACCOUNT_MONEY_FIELDS)
         except Exception as e:
-            logger.error(f"Error adding referral bonus: {e}")
-            self.conn.rollback()
-            return False
+            logger.error("Error getting account: %s", e)
+            return None
+        
+        self._cache_account(telegram_id, account)
+        return account
 
     def update_balance(self, telegram_id: int, amount: Decimal, 
                       is_deposit: bool = True, is_locked: bool = False) -> bool:
         """Update account balance"""
-        if not self.is_connected:
-            user_id = str(telegram_id)
-            if user_id not in self.accounts:
-                return False
-            
-            account = self.accounts[user_id]
-            if is_deposit:
-                account['balance'] += amount
-                account['available_balance'] += amount
-                account['total_deposits'] += amount
-            else:
-                if account['available_balance'] >= amount:
-                    account['balance'] -= amount
-                    account['available_balance'] -= amount
-                    account['total_withdrawals'] += amount
-                else:
-                    return False
-            return True
-        
         try:
-            if is_deposit:
-                self.cursor.execute("""
-                    UPDATE accounts 
-                    SET balance = balance + %s,
-                        available_balance = available_balance + %s,
-                        total_deposits = total_deposits + %s,
-                        updated_at = NOW()
-                    WHERE user_telegram_id = %s
-                """, (amount, amount, amount, telegram_id))
-            else:
-                self.cursor.execute("""
-                    UPDATE accounts 
-                    SET balance = balance - %s,
-                        available_balance = available_balance - %s,
-                        total_withdrawals = total_withdrawals + %s,
-                        updated_at = NOW()
-                    WHERE user_telegram_id = %s 
-                    AND available_balance >= %s
-                """, (amount, amount, amount, telegram_id, amount))
+            with self._cursor() as cur:
+                if is_deposit:
+                    self._execute_prepared(cur, 'deposit_funds', (telegram_id, to_cents(amount)))
+                else:
+                    self._execute_prepared(cur, 'withdraw_funds', (telegram_id, to_cents(amount)))
             
-            self.conn.commit()
-            return self.cursor.rowcount > 0
+                updated = cur.rowcount > 0
+            self._invalidate_account(telegram_id)
+            return updated
         except Exception as e:
-            logger.error(f"Error updating balance: {e}")
-            self.conn.rollback()
+            logger.error("Error updating balance: %s", e)
             return False
 
     def lock_funds(self, telegram_id: int, amount: Decimal) -> bool:
         """Lock funds for savings plan"""
-        if not self.is_connected:
-            user_id = str(telegram_id)
-            if user_id not in self.accounts:
-                return False
-            
-            account = self.accounts[user_id]
-            if account['available_balance'] >= amount:
-                account['available_balance'] -= amount
-                account['locked_balance'] += amount
-                return True
-            return False
-        
         try:
-            self.cursor.execute("""
-                UPDATE accounts 
-                SET available_balance = available_balance - %s,
-                    locked_balance = locked_balance + %s,
-                    updated_at = NOW()
-                WHERE user_telegram_id = %s 
-                AND available_balance >= %s
-            """, (amount, amount, telegram_id, amount))
-            self.conn.commit()
-            return self.cursor.rowcount > 0
+            with self._cursor() as cur:
+                self._execute_prepared(cur, 'lock_funds', (telegram_id, to_cents(amount)))
+                locked = cur.rowcount > 0
+            self._invalidate_account(telegram_id)
+            return locked
         except Exception as e:
-            logger.error(f"Error locking funds: {e}")
-            self.conn.rollback()
+            logger.error("Error locking funds: %s", e)
             return False
 
     def unlock_funds(self, telegram_id: int, amount: Decimal) -> bool:
         """Unlock funds from savings plan"""
-        if not self.is_connected:
-            user_id = str(telegram_id)
-            if user_id not in self.accounts:
-                return False
-            
-            account = self.accounts[user_id]
-            if account['locked_balance'] >= amount:
-                account['locked_balance'] -= amount
-                account['available_balance'] += amount
-                return True
-            return False
-        
         try:
-            self.cursor.execute("""
-                UPDATE accounts 
-                SET locked_balance = locked_balance - %s,
-                    available_balance = available_balance + %s,
-                    updated_at = NOW()
-                WHERE user_telegram_id = %s 
-                AND locked_balance >= %s
-            """, (amount, amount, telegram_id, amount))
-            self.conn.commit()
-            return self.cursor.rowcount > 0
+            with self._cursor() as cur:
+                self._execute_prepared(cur, 'unlock_funds', (telegram_id, to_cents(amount)))
+                unlocked = cur.rowcount > 0
+            self._invalidate_account(telegram_id)
+            return unlocked
         except Exception as e:
-            logger.error(f"Error unlocking funds: {e}")
-            self.conn.rollback()
+            logger.error("Error unlocking funds: %s", e)
             return False
 
     # ========== SAVINGS PLAN OPERATIONS ==========
 
-    def get_savings_templates(self) -> List[Dict[str, Any]]:
-        """Get all active savings plan templates"""
-        if not self.is_connected:
-            return [
-                {'id': 1, 'name': 'Basic', 'description': '24-hour savings plan', 'duration_days': 1, 
-                 'min_amount': 100.00, 'daily_rate': 0.01, 'total_rate': 1.0, 'is_locked': False},
-                {'id': 2, 'name': 'Silver', 'description': '7-day locked savings', 'duration_days': 7,
-                 'min_amount': 1000.00, 'daily_rate': 0.012, 'total_rate': 8.4, 'is_locked': True},
-                {'id': 3, 'name': 'Gold', 'description': '15-day premium', 'duration_days': 15,
-                 'min_amount': 5000.00, 'daily_rate': 0.014, 'total_rate': 21.0, 'is_locked': True},
-                {'id': 4, 'name': 'Platinum', 'description': '30-day premium', 'duration_days': 30,
-                 'min_amount': 10000.00, 'daily_rate': 0.016, 'total_rate': 48.0, 'is_locked': True},
-                {'id': 5, 'name': 'Diamond', 'description': '90-day premium', 'duration_days': 90,
-                 'min_amount': 25000.00, 'daily_rate': 0.017, 'total_rate': 153.0, 'is_locked': True}
-            ]
+    def _active_templates(self) -> Tuple[List[Dict[str, Any]], Dict[int, Dict[str, Any]]]:
+        """Active templates in display order plus an id index, cached together"""
+        with self._template_cache_lock:
+            cached = self._template_cache.get('active')
+        if cached is not None:
+            return cached
         
         try:
-            self.cursor.execute("""
-                SELECT * FROM savings_plan_templates 
-                WHERE is_active = TRUE 
-                ORDER BY min_amount
-            """)
-            return self.cursor.fetchall()
+            with self._cursor() as cur:
+                cur.execute("""
+                    SELECT * FROM savings_plan_templates 
+                    WHERE is_active = TRUE 
+                    ORDER BY min_amount
+                """)
+                templates = cur.fetchall()
+            cached = (templates, {t['id']: t for t in templates})
+            with self._template_cache_lock:
+                self._template_cache['active'] = cached
+            return cached
         except Exception as e:
-            logger.error(f"Error getting savings templates: {e}")
-            return []
+            logger.error("Error getting savings templates: %s", e)
+            return [], {}
+
+    def get_savings_templates(self) -> List[Dict[str, Any]]:
+        """Get all active savings plan templates"""
+        return self._active_templates()[0]
+
+    def get_savings_template(self, template_id: int) -> Optional[Dict[str, Any]]:
+        """Get one active savings plan template by id"""
+        return self._active_templates()[1].get(template_id)
 
     def create_savings_plan(self, telegram_id: int, template_id: int, plan_name: str,
                            principal_amount: Decimal, daily_rate: Decimal, 
                            duration_days: int, is_locked: bool) -> Optional[str]:
         """Create user savings plan"""
-        plan_id = f"SP{secrets.token_hex(4).upper()}"
         start_date = datetime.now().date()
         end_date = start_date + timedelta(days=duration_days)
         
-        if not self.is_connected:
-            self.savings_plans.append({
-                'plan_id': plan_id,
-                'user_telegram_id': telegram_id,
-                'template_id': template_id,
-                'plan_name': plan_name,
-                'principal_amount': principal_amount,
-                'current_value': principal_amount,
-                'interest_earned': 0,
-                'daily_rate': daily_rate,
-                'start_date': start_date,
-                'end_date': end_date,
-                'status': 'ACTIVE',
-                'is_locked': is_locked
-            })
-            return plan_id
-        
         try:
-            self.cursor.execute("""
-                INSERT INTO user_savings_plans 
-                (plan_id, user_telegram_id, template_id, plan_name, principal_amount, 
-                 current_value, daily_rate, start_date, end_date, status, is_locked, created_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, 'ACTIVE', %s, NOW())
-                RETURNING plan_id
-            """, (plan_id, telegram_id, template_id, plan_name, principal_amount,
-                  principal_amount, daily_rate, start_date, end_date, is_locked))
+            with self._cursor() as cur:
+                # Plan ID is generated server-side and regenerated on a collision
+                for _ in range(GENERATED_ID_ATTEMPTS):
+                    cur.execute("""
+                        INSERT INTO user_savings_plans 
+                        (plan_id, user_telegram_id, template_id, plan_name, principal_amount, 
+                         current_value, daily_rate, start_date, end_date, status, is_locked, created_at)
+                        VALUES ('SP' || upper(encode(gen_random_bytes(4), 'hex')), 
+                                %s, %s, %s, %s, %s, %s, %s, %s, 'ACTIVE', %s, NOW())
+                        ON CONFLICT (plan_id) DO NOTHING
+                        RETURNING plan_id
+                    """, (telegram_id, template_id, plan_name, principal_amount,
+                          principal_amount, daily_rate, start_date, end_date, is_locked))
             
-            result = self.cursor.fetchone()
-            self.conn.commit()
-            return result['plan_id'] if result else None
+                    result = cur.fetchone()
+                    if result:
+                        return result['plan_id']
+                return None
             
         except Exception as e:
-            logger.error(f"Error creating savings plan: {e}")
-            self.conn.rollback()
+            logger.error("Error creating savings plan: %s", e)
             return None
 
     def get_user_savings_plans(self, telegram_id: int) -> List[Dict[str, Any]]:
         """Get all user's savings plans"""
-        if not self.is_connected:
-            return [p for p in self.savings_plans if p['user_telegram_id'] == telegram_id]
-        
         try:
-            self.cursor.execute("""
-                SELECT * FROM user_savings_plans 
-                WHERE user_telegram_id = %s 
-                ORDER BY created_at DESC
-            """, (telegram_id,))
-            return self.cursor.fetchall()
+            with self._cursor() as cur:
+                self._execute_prepared(cur, 'get_user_savings_plans', (telegram_id,))
+                return cur.fetchall()
         except Exception as e:
-            logger.error(f"Error getting user savings plans: {e}")
+            logger.error("Error getting user savings plans: %s", e)
             return []
 
-    def calculate_and_add_interest(self, telegram_id: int) -> Decimal:
-        """Calculate and add interest for all user's active savings plans"""
-        total_interest = Decimal('0.00')
-        plans = self.get_user_savings_plans(telegram_id)
+    def apply_pending_interest_and_fetch(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+        """Apply pending savings interest and return the up-to-date account, in one statement"""
+        try:
+            with self._cursor() as cur:
+                self._execute_prepared(cur, 'apply_interest_and_fetch', (telegram_id, NY_TZ.key))
+                account = decode_money(cur.fetchone(), ACCOUNT_MONEY_FIELDS)
+        except Exception as e:
+            logger.error("Error applying interest: %s", e)
+            return None
         
-        for plan in plans:
-            if plan['status'] != 'ACTIVE':
-                continue
-            
-            last_calc = plan.get('last_interest_calc')
-            if last_calc:
-                last_calc = last_calc.replace(tzinfo=NY_TZ)
-            else:
-                last_calc = plan['start_date']
-                if isinstance(last_calc, datetime):
-                    last_calc = last_calc.date()
-                last_calc = datetime.combine(last_calc, datetime.min.time()).replace(tzinfo=NY_TZ)
+        self._cache_account(telegram_id, account)
+        return account
+
+    # ========== TRANSACTION OPERATIONS ==========
+
+    def create_transaction(self, telegram_id: int, tx_type: str, amount: Decimal,
+                          method: str = None, crypto_currency: str = None,
+                          crypto_address: str = None) -> Optional[str]:
+        """Create new transaction"""
+        tx_id = f"TX{secrets.token_hex(4).upper()}"
+        
+        try:
+            with self._cursor() as cur:
+                self._execute_prepared(cur, 'create_transaction', (
+                    tx_id, telegram_id, tx_type, method, to_cents(amount),
+                    crypto_currency, crypto_address
+                ))
             
-            now = datetime.now(NY_TZ)
-            days_diff = (now - last_calc).days
+                result = cur.fetchone()
+                return result['transaction_id'] if result else None
             
-            if days_diff > 0:
-                # Calculate interest for each day
-                for day in range(days_diff):
-                    calc_date = (last_calc + timedelta(days=day+1)).date()
-                    if plan['start_date'] <= calc_date <= plan['end_date']:
-                        daily_interest = plan['principal_amount'] * plan['daily_rate']
-                        total_interest += daily_interest
-                        
-                        if self.is_connected:
-                            self.cursor.execute("""
-                                INSERT INTO daily_interest_logs 
-                                (user_telegram_id, savings_plan_id, calculation_date, 
-                                 interest_amount, principal_amount, daily_rate, is_applied)
-                                VALUES (%s, %s, %s, %s, %s, %s, FALSE)
-                            """, (telegram_id, plan['id'], 
-                                  calc_date,
-                                  daily_interest, plan['principal_amount'], plan['daily_rate']))
-        
-        if total_interest > 0 and self.is_connected:
-            self.conn.commit()
+        except Exception as e:
+            logger.error("Error creating transaction: %s", e)
+            return None
+
+    def update_transaction_status(self, transaction_id: str, status: str,
+                                  admin_id: int = None, note: str = None) -> bool:
+        """Update transaction status"""
+        try:
+            with self._cursor() as cur:
+                cur.execute("""
+                    UPDATE transactions 
+                    SET status = %s,
+                        reviewed_by = %s,
+                        admin_note = %s,
+                        reviewed_at = NOW(),
+                        completed_at = CASE WHEN %s = 'COMPLETED' THEN NOW() ELSE completed_at END
+                    WHERE transaction_id = %s
+                """, (status, admin_id, note, status, transaction_id))
+                return cur.rowcount > 0
+        except Exception as e:
+            logger.error("Error updating transaction: %s", e)
+            return False
+
+    def get_user_transactions(self, telegram_id: int, limit: int = 10) -> List[TransactionHistoryRow]:
+        """Get user's recent transactions, newest first"""
+        try:
+            with self._cursor(cursor_factory=None) as cur:
+                self._execute_prepared(cur, 'get_user_transactions', (telegram_id, limit))
+                return [
+                    TransactionHistoryRow(row[0], row[1], from_cents(row[2]), *row[3:])
+                    for row in cur.fetchall()
+                ]
+        except Exception as e:
+            logger.error("Error getting user transactions: %s", e)
+            return []
+
+    # ========== AUDIT OPERATIONS ==========
+
+    def log_audit(self, action: str, actor: str, actor_id: int, description: str,
+                 target_user: int = None, reference_id: int = None,
+                 old_value: str = None, new_value: str = None) -> bool:
+        """Log audit entry"""
+        try:
+            with self._cursor() as cur:
+                # Audit rows can tolerate sub-second loss on a crash
+                self._skip_commit_fsync(cur)
+                cur.execute("""
+                    INSERT INTO audit_logs 
+                    (action, actor, actor_id, target_user, reference_id, 
+                     description, old_value, new_value, timestamp)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW())
+                """, (action, actor, actor_id, target_user, reference_id,
+                      description, old_value, new_value))
+                return True
+        except Exception as e:
+            logger.error("Error logging audit: %s", e)
+            return False
+
+    def queue_audit(self, action: str, actor: str, actor_id: int, description: str,
+                    target_user: int = None, reference_id: int = None,
+                    old_value: str = None, new_value: str = None):
+        """Queue an audit entry for the next batched write"""
+        self._audit_queue.put((action, actor, actor_id, target_user, reference_id,
+                               description, old_value, new_value))
+
+    def _audit_writer(self):
+        """Drain queued audit entries into audit_logs, one COPY per batch"""
+        stopping = False
+        while not stopping:
+            entry = self._audit_queue.get()
+            if entry is None:
+                return
+            batch = [entry]
+            deadline = time.monotonic() + AUDIT_FLUSH_INTERVAL
+            while len(batch) < AUDIT_BATCH_SIZE:
+                try:
+                    entry = self._audit_queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+            try:
+                # timestamp is left to the column's server-side NOW() default
+                self.bulk_load('audit_logs', batch, (
+                    'action', 'actor', 'actor_id', 'target_user', 'reference_id',
+                    'description', 'old_value', 'new_value'
+                ))
+            except Exception as e:
+                logger.error("Error writing %s audit entries: %s", len(batch), e)
+
+    def get_audit_logs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Get recent audit logs"""
+        try:
+            with self._cursor() as cur:
+                cur.execute("""
+                    SELECT * FROM audit_logs 
+                    ORDER BY timestamp DESC 
+                    LIMIT %s
+                """, (limit,))
+                return cur.fetchall()
+        except Exception as e:
+            logger.error("Error getting audit logs: %s", e)
+            return []
+
+    # ========== COMPOSITE OPERATIONS ==========
+
+    def approve_registration(self, telegram_id: int, admin_id: int) -> bool:
+        """Approve a user; bonuses, referral and audit run server-side in one call"""
+        try:
+            with self._cursor() as cur:
+                cur.execute("""
+                    UPDATE users 
+                    SET status = 'APPROVED', updated_at = NOW() 
+                    WHERE telegram_id = %s
+                """, (telegram_id,))
+                if cur.rowcount == 0:
+                    return False
+                cur.execute(
+                    "SELECT apply_signup_bonuses(%s, %s, %s, %s)",
+                    (telegram_id, admin_id, REGISTRATION_BONUS_CENTS, REFERRAL_BONUS_CENTS)
+                )
+            self._invalidate_user(telegram_id)
+            # The referrer is credited server-side, so their id is not known here
+            self._invalidate_account()
+            return True
+        except Exception as e:
+            logger.error("Error approving user: %s", e)
+            return False
+
+    def close(self):
+        """Flush queued audit entries and close all pooled database connections"""
+        self._audit_queue.put(None)
+        self._audit_thread.join()
+        self.pool.closeall()
+        logger.info("✅ Database connections closed")
+
+class MemoryBackend(DatabaseManager):
+    """In-memory storage for development and when the database is unreachable"""
+    
+    def __init__(self):
+        self.users = {}
+        self.users_by_email = {}
+        self.users_by_referral = {}
+        self.accounts = {}
+        self.transactions = {}
+        self.tx_by_user = {}
+        self.pending_tx = {}  # insertion-ordered set of pending transaction IDs
+        self.savings_plans = []
+        self.audit_logs = deque(maxlen=MEMORY_AUDIT_LOG_SIZE)
+        self.referrals = {}
+        self.savings_templates = [
+            {'id': 1, 'name': 'Basic', 'description': '24-hour savings plan', 'duration_days': 1, 
+             'min_amount': 100.00, 'daily_rate': 0.01, 'total_rate': 1.0, 'is_locked': False},
+            {'id': 2, 'name': 'Silver', 'description': '7-day locked savings', 'duration_days': 7,
+             'min_amount': 1000.00, 'daily_rate': 0.012, 'total_rate': 8.4, 'is_locked': True},
+            {'id': 3, 'name': 'Gold', 'description': '15-day premium', 'duration_days': 15,
+             'min_amount': 5000.00, 'daily_rate': 0.014, 'total_rate': 21.0, 'is_locked': True},
+            {'id': 4, 'name': 'Platinum', 'description': '30-day premium', 'duration_days': 30,
+             'min_amount': 10000.00, 'daily_rate': 0.016, 'total_rate': 48.0, 'is_locked': True},
+            {'id': 5, 'name': 'Diamond', 'description': '90-day premium', 'duration_days': 90,
+             'min_amount': 25000.00, 'daily_rate': 0.017, 'total_rate': 153.0, 'is_locked': True}
+        ]
+        self.templates_by_id = {t['id']: t for t in self.savings_templates}
+        logger.info("📁 Using in-memory storage (development mode)")
+
+    # ========== USER OPERATIONS ==========
+
+    def get_user(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+        """Get user by Telegram ID"""
+        return self.users.get(str(telegram_id))
+
+    def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Get user by email"""
+        return self.users_by_email.get(email)
+
+    def email_exists(self, email: str) -> bool:
+        """Check whether an email is already registered"""
+        return email in self.users_by_email
+
+    def get_user_by_referral(self, referral_code: str) -> Optional[Dict[str, Any]]:
+        """Get user by referral code"""
+        return self.users_by_referral.get(referral_code)
+
+    def create_user(self, telegram_id: int, full_name: str, phone: str, email: str, 
+                   password_hash: str, referred_by: Optional[str] = None) -> bool:
+        """Create new user"""
+        user_id = str(telegram_id)
+        if user_id in self.users or email in self.users_by_email:
+            return False
+
+        ref_code = f"REF{secrets.token_hex(4).upper()}"
+
+        user = self.users[user_id] = {
+            'telegram_id': telegram_id,
+            'full_name': full_name,
+            'phone_number': phone,
+            'email': email,
+            'password_hash': password_hash,
+            'referral_code': ref_code,
+            'referred_by': referred_by,
+            'status': 'PENDING',
+            'is_email_verified': False,
+            'created_at': datetime.now()
+        }
+        self.users_by_email[email] = user
+        self.users_by_referral[ref_code] = user
+        if referred_by is not None:
+            # Paid out by process_referral_bonus once the user is approved
+            self.add_referral(referred_by, telegram_id)
+
+        # Create account (money fields in int cents)
+        self.accounts[user_id] = {
+            'user_telegram_id': telegram_id,
+            'balance': 0,
+            'locked_balance': 0,
+            'available_balance': 0,
+            'total_deposits': 0,
+            'total_withdrawals': 0,
+            'total_interest_earned': 0,
+            'status': 'ACTIVE',
+            'created_at': datetime.now()
+        }
+
+        return True
+
+    def save_otp(self, telegram_id: int, otp_code: str) -> bool:
+        """Save OTP for user"""
+        user_id = str(telegram_id)
+        if user_id in self.users:
+            self.users[user_id]['otp_code'] = otp_code
+            self.users[user_id]['otp_expiry'] = datetime.now() + timedelta(minutes=OTP_EXPIRY_MINUTES)
+            return True
+        return False
+
+    def verify_otp(self, telegram_id: int, otp_code: str) -> Tuple[bool, str]:
+        """Verify OTP code"""
+        user_id = str(telegram_id)
+        if user_id not in self.users:
+            return False, "User not found"
+
+        user = self.users[user_id]
+        if not user.get('otp_code'):
+            return False, "No OTP found"
+
+        if user['otp_code'] != otp_code:
+            return False, "Invalid OTP"
+
+        if datetime.now() > user.get('otp_expiry', datetime.now()):
+            return False, "OTP expired"
+
+        user['is_email_verified'] = True
+        user['otp_code'] = None
+        user['otp_expiry'] = None
+        return True, "Email verified"
+
+    def update_user_status(self, telegram_id: int, status: str) -> bool:
+        """Update user status"""
+        user_id = str(telegram_id)
+        if user_id in self.users:
+            self.users[user_id]['status'] = status
+            return True
+        return False
+
+    def get_pending_users(self) -> List[PendingUserRow]:
+        """Get all pending users (email verified)"""
+        return [
+            PendingUserRow(u['telegram_id'], u['full_name'], u['email'], u['created_at'])
+            for u in self.users.values()
+            if u['status'] == 'PENDING' and u.get('is_email_verified')
+        ]
+
+    def get_all_users(self, limit: int = ADMIN_USERS_PAGE_SIZE,
+                      after: Optional[Tuple[datetime, int]] = None) -> List[UserListRow]:
+        """Get a page of users, newest first, following an (created_at, telegram_id) cursor (admin only)"""
+        rows = []
+        ordered = sorted(self.users.values(), key=lambda u: (u['created_at'], u['telegram_id']), reverse=True)
+        for u in ordered:
+            if after is not None and (u['created_at'], u['telegram_id']) >= after:
+                continue
+            if len(rows) == limit:
+                break
+            account = self.accounts.get(str(u['telegram_id']))
+            balance = from_cents(account['balance']) if account else None
+            rows.append(UserListRow(u['telegram_id'], u['full_name'], u['status'], u['created_at'], balance))
+        return rows
+
+    def count_users(self) -> int:
+        """Count all registered users"""
+        return len(self.users)
+
+    def get_user_with_account(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+        """Get a user row together with its account balances"""
+        user = self.get_user(telegram_id)
+        if user is None:
+            return None
+        row = dict(user)
+        account = self.get_account(telegram_id)
+        for field in USER_BALANCE_FIELDS:
+            row[field] = account[field] if account else None
+        return row
+
+    def get_admin_overview(self) -> Optional[AdminOverview]:
+        """Get user, balance and pending transaction totals"""
+        statuses = [u['status'] for u in self.users.values()]
+        pending_types = [self.transactions[tx_id]['type'] for tx_id in self.pending_tx]
+        return AdminOverview(
+            total_users=len(statuses),
+            pending_users=statuses.count('PENDING'),
+            approved_users=statuses.count('APPROVED'),
+            total_balance=from_cents(sum(a['balance'] for a in self.accounts.values())),
+            pending_deposits=pending_types.count('DEPOSIT'),
+            pending_withdrawals=pending_types.count('WITHDRAW')
+        )
+
+    # ========== ACCOUNT OPERATIONS ==========
+
+    def get_account(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+        """Get account by user ID"""
+        account = self.accounts.get(str(telegram_id))
+        if account is None:
+            return None
+        view = dict(account)
+        for field in ACCOUNT_MONEY_FIELDS:
+            view[field] = from_cents(account[field])
+        return view
+
+    def add_registration_bonus(self, telegram_id: int) -> bool:
+        """Add registration bonus to user"""
+        user_id = str(telegram_id)
+        if user_id in self.accounts:
+            self.accounts[user_id]['balance'] += REGISTRATION_BONUS_CENTS
+            self.accounts[user_id]['available_balance'] += REGISTRATION_BONUS_CENTS
+            return True
+        return False
+
+    def add_referral_bonus(self, referrer_id: int) -> bool:
+        """Add referral bonus to referrer"""
+        user_id = str(referrer_id)
+        if user_id in self.accounts:
+            self.accounts[user_id]['balance'] += REFERRAL_BONUS_CENTS
+            self.accounts[user_id]['available_balance'] += REFERRAL_BONUS_CENTS
+            return True
+        return False
+
+    def update_balance(self, telegram_id: int, amount: Decimal, 
+                      is_deposit: bool = True, is_locked: bool = False) -> bool:
+        """Update account balance"""
+        user_id = str(telegram_id)
+        if user_id not in self.accounts:
+            return False
+
+        account = self.accounts[user_id]
+        cents = to_cents(amount)
+        if is_deposit:
+            account['balance'] += cents
+            account['available_balance'] += cents
+            account['total_deposits'] += cents
+        else:
+            if account['available_balance'] >= cents:
+                account['balance'] -= cents
+                account['available_balance'] -= cents
+                account['total_withdrawals'] += cents
+            else:
+                return False
+        return True
+
+    def lock_funds(self, telegram_id: int, amount: Decimal) -> bool:
+        """Lock funds for savings plan"""
+        user_id = str(telegram_id)
+        if user_id not in self.accounts:
+            return False
+
+        account = self.accounts[user_id]
+        cents = to_cents(amount)
+        if account['available_balance'] >= cents:
+            account['available_balance'] -= cents
+            account['locked_balance'] += cents
+            return True
+        return False
+
+    def unlock_funds(self, telegram_id: int, amount: Decimal) -> bool:
+        """Unlock funds from savings plan"""
+        user_id = str(telegram_id)
+        if user_id not in self.accounts:
+            return False
+
+        account = self.accounts[user_id]
+        cents = to_cents(amount)
+        if account['locked_balance'] >= cents:
+            account['locked_balance'] -= cents
+            account['available_balance'] += cents
+            return True
+        return False
+
+    # ========== SAVINGS PLAN OPERATIONS ==========
+
+    def get_savings_templates(self) -> List[Dict[str, Any]]:
+        """Get all active savings plan templates"""
+        return self.savings_templates
+
+    def get_savings_template(self, template_id: int) -> Optional[Dict[str, Any]]:
+        """Get one active savings plan template by id"""
+        return self.templates_by_id.get(template_id)
+
+    def create_savings_plan(self, telegram_id: int, template_id: int, plan_name: str,
+                           principal_amount: Decimal, daily_rate: Decimal, 
+                           duration_days: int, is_locked: bool) -> Optional[str]:
+        """Create user savings plan"""
+        start_date = datetime.now().date()
+        end_date = start_date + timedelta(days=duration_days)
         
-        return total_interest
+        plan_id = f"SP{secrets.token_hex(4).upper()}"
+        self.savings_plans.append({
+            'plan_id': plan_id,
+            'user_telegram_id': telegram_id,
+            'template_id': template_id,
+            'plan_name': plan_name,
+            'principal_amount': principal_amount,
+            'current_value': principal_amount,
+            'interest_earned': 0,
+            'daily_rate': daily_rate,
+            'start_date': start_date,
+            'end_date': end_date,
+            'status': 'ACTIVE',
+            'is_locked': is_locked
+        })
+        return plan_id
+
+    def get_user_savings_plans(self, telegram_id: int) -> List[Dict[str, Any]]:
+        """Get all user's savings plans, with progress in days and percent"""
+        today = datetime.now().date()
+        plans = []
+        for p in self.savings_plans:
+            if p['user_telegram_id'] != telegram_id:
+                continue
+            progress = (today - p['start_date']).days
+            total_days = (p['end_date'] - p['start_date']).days
+            # Returned as the stored dicts so interest written back to them persists
+            p.update(
+                progress_days=progress,
+                total_days=total_days,
+                progress_pct=min(100, progress * 100 // total_days) if total_days else 100
+            )
+            plans.append(p)
+        return plans
+
+    def apply_pending_interest(self, telegram_id: int) -> Decimal:
+        """Calculate pending savings interest and credit it to the account"""
+        interest = self.calculate_and_add_interest(telegram_id)
+        account = self.accounts.get(str(telegram_id))
+        if account and interest > 0:
+            cents = to_cents(interest)
+            account['balance'] += cents
+            account['available_balance'] += cents
+            account['total_interest_earned'] += cents
+        return interest
 
     # ========== TRANSACTION OPERATIONS ==========
 
@@ -881,172 +1811,69 @@ class DatabaseManager:
         """Create new transaction"""
         tx_id = f"TX{secrets.token_hex(4).upper()}"
         
-        if not self.is_connected:
-            self.transactions.append({
-                'transaction_id': tx_id,
-                'user_telegram_id': telegram_id,
-                'type': tx_type,
-                'method': method,
-                'amount': amount,
-                'net_amount': amount,
-                'status': 'PENDING',
-                'crypto_currency': crypto_currency,
-                'crypto_address': crypto_address,
-                'requested_at': datetime.now()
-            })
-            return tx_id
-        
-        try:
-            self.cursor.execute("""
-                INSERT INTO transactions 
-                (transaction_id, user_telegram_id, type, method, amount, net_amount,
-                 crypto_currency, crypto_address, status, requested_at)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 'PENDING', NOW())
-                RETURNING transaction_id
-            """, (tx_id, telegram_id, tx_type, method, amount, amount,
-                  crypto_currency, crypto_address))
-            
-            result = self.cursor.fetchone()
-            self.conn.commit()
-            return result['transaction_id'] if result else None
-            
-        except Exception as e:
-            logger.error(f"Error creating transaction: {e}")
-            self.conn.rollback()
-            return None
+        self.transactions[tx_id] = {
+            'transaction_id': tx_id,
+            'user_telegram_id': telegram_id,
+            'type': tx_type,
+            'method': method,
+            'amount': amount,
+            'net_amount': amount,
+            'status': 'PENDING',
+            'crypto_currency': crypto_currency,
+            'crypto_address': crypto_address,
+            'requested_at': datetime.now()
+        }
+        self.tx_by_user.setdefault(telegram_id, []).append(tx_id)
+        self.pending_tx[tx_id] = None
+        return tx_id
 
     def update_transaction_status(self, transaction_id: str, status: str,
                                   admin_id: int = None, note: str = None) -> bool:
         """Update transaction status"""
-        if not self.is_connected:
-            for tx in self.transactions:
-                if tx['transaction_id'] == transaction_id:
-                    tx['status'] = status
-                    tx['reviewed_by'] = admin_id
-                    tx['admin_note'] = note
-                    tx['reviewed_at'] = datetime.now()
-                    if status == 'COMPLETED':
-                        tx['completed_at'] = datetime.now()
-                    return True
-            return False
-        
-        try:
-            self.cursor.execute("""
-                UPDATE transactions 
-                SET status = %s,
-                    reviewed_by = %s,
-                    admin_note = %s,
-                    reviewed_at = NOW(),
-                    completed_at = CASE WHEN %s = 'COMPLETED' THEN NOW() ELSE completed_at END
-                WHERE transaction_id = %s
-            """, (status, admin_id, note, status, transaction_id))
-            self.conn.commit()
-            return self.cursor.rowcount > 0
-        except Exception as e:
-            logger.error(f"Error updating transaction: {e}")
-            self.conn.rollback()
+        tx = self.transactions.get(transaction_id)
+        if tx is None:
             return False
-
-    def get_user_transactions(self, telegram_id: int, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get user's recent transactions"""
-        if not self.is_connected:
-            return [tx for tx in self.transactions if tx['user_telegram_id'] == telegram_id][:limit]
-        
-        try:
-            self.cursor.execute("""
-                SELECT * FROM transactions 
-                WHERE user_telegram_id = %s 
-                ORDER BY requested_at DESC 
-                LIMIT %s
-            """, (telegram_id, limit))
-            return self.cursor.fetchall()
-        except Exception as e:
-            logger.error(f"Error getting user transactions: {e}")
-            return []
-
-    def get_pending_transactions(self, tx_type: str = None) -> List[Dict[str, Any]]:
-        """Get pending transactions"""
-        if not self.is_connected:
-            if tx_type:
-                return [tx for tx in self.transactions if tx['status'] == 'PENDING' and tx['type'] == tx_type]
-            return [tx for tx in self.transactions if tx['status'] == 'PENDING']
-        
-        try:
-            if tx_type:
-                self.cursor.execute("""
-                    SELECT * FROM transactions 
-                    WHERE status = 'PENDING' AND type = %s 
-                    ORDER BY requested_at
-                """, (tx_type,))
-            else:
-                self.cursor.execute("""
-                    SELECT * FROM transactions 
-                    WHERE status = 'PENDING' 
-                    ORDER BY requested_at
-                """)
-            return self.cursor.fetchall()
-        except Exception as e:
-            logger.error(f"Error getting pending transactions: {e}")
-            return []
+        tx['status'] = status
+        tx['reviewed_by'] = admin_id
+        tx['admin_note'] = note
+        tx['reviewed_at'] = datetime.now()
+        if status == 'COMPLETED':
+            tx['completed_at'] = datetime.now()
+        if status != 'PENDING':
+            self.pending_tx.pop(transaction_id, None)
+        return True
+
+    def get_user_transactions(self, telegram_id: int, limit: int = 10) -> List[TransactionHistoryRow]:
+        """Get user's recent transactions, newest first"""
+        rows = []
+        for tx_id in reversed(self.tx_by_user.get(telegram_id, [])[-limit:]):
+            tx = self.transactions[tx_id]
+            rows.append(TransactionHistoryRow(
+                tx_id, tx['type'], tx['amount'], tx['method'] or 'BANK', tx['status'], tx['requested_at']
+            ))
+        return rows
 
     # ========== REFERRAL OPERATIONS ==========
 
     def add_referral(self, referrer_id: int, referred_id: int) -> bool:
         """Add referral relationship"""
-        if not self.is_connected:
-            key = f"{referrer_id}_{referred_id}"
-            self.referrals[key] = {
-                'referrer_id': referrer_id,
-                'referred_id': referred_id,
-                'bonus_paid': False,
-                'created_at': datetime.now()
-            }
-            return True
-        
-        try:
-            self.cursor.execute("""
-                INSERT INTO referrals (referrer_id, referred_id, created_at)
-                VALUES (%s, %s, NOW())
-            """, (referrer_id, referred_id))
-            self.conn.commit()
-            return True
-        except Exception as e:
-            logger.error(f"Error adding referral: {e}")
-            self.conn.rollback()
-            return False
+        self.referrals[referred_id] = {
+            'referrer_id': referrer_id,
+            'referred_id': referred_id,
+            'bonus_paid': False,
+            'created_at': datetime.now()
+        }
+        return True
 
     def process_referral_bonus(self, referred_id: int) -> bool:
         """Process referral bonus for referrer"""
-        if not self.is_connected:
-            for key, ref in self.referrals.items():
-                if ref['referred_id'] == referred_id and not ref['bonus_paid']:
-                    referrer_id = ref['referrer_id']
-                    if self.add_referral_bonus(referrer_id):
-                        ref['bonus_paid'] = True
-                        return True
-            return False
-        
-        try:
-            # Get referrer
-            self.cursor.execute("""
-                SELECT referrer_id FROM referrals 
-                WHERE referred_id = %s AND bonus_paid = FALSE
-            """, (referred_id,))
-            result = self.cursor.fetchone()
-            
-            if result and self.add_referral_bonus(result['referrer_id']):
-                self.cursor.execute("""
-                    UPDATE referrals 
-                    SET bonus_paid = TRUE 
-                    WHERE referred_id = %s
-                """, (referred_id,))
-                self.conn.commit()
-                return True
-            return False
-        except Exception as e:
-            logger.error(f"Error processing referral bonus: {e}")
-            self.conn.rollback()
+        ref = self.referrals.get(referred_id)
+        if ref is None or ref['bonus_paid']:
             return False
+        if self.add_referral_bonus(ref['referrer_id']):
+            ref['bonus_paid'] = True
+            return True
+        return False
 
     # ========== AUDIT OPERATIONS ==========
 
@@ -1054,61 +1881,56 @@ class DatabaseManager:
                  target_user: int = None, reference_id: int = None,
                  old_value: str = None, new_value: str = None) -> bool:
         """Log audit entry"""
-        if not self.is_connected:
-            self.audit_logs.append({
-                'action': action,
-                'actor': actor,
-                'actor_id': actor_id,
-                'target_user': target_user,
-                'reference_id': reference_id,
-                'description': description,
-                'old_value': old_value,
-                'new_value': new_value,
-                'timestamp': datetime.now()
-            })
-            return True
-        
-        try:
-            self.cursor.execute("""
-                INSERT INTO audit_logs 
-                (action, actor, actor_id, target_user, reference_id, 
-                 description, old_value, new_value, timestamp)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW())
-            """, (action, actor, actor_id, target_user, reference_id,
-                  description, old_value, new_value))
-            self.conn.commit()
-            return True
-        except Exception as e:
-            logger.error(f"Error logging audit: {e}")
-            self.conn.rollback()
-            return False
+        self.audit_logs.append({
+            'action': action,
+            'actor': actor,
+            'actor_id': actor_id,
+            'target_user': target_user,
+            'reference_id': reference_id,
+            'description': description,
+            'old_value': old_value,
+            'new_value': new_value,
+            'timestamp': datetime.now()
+        })
+        return True
 
     def get_audit_logs(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent audit logs"""
-        if not self.is_connected:
-            return self.audit_logs[-limit:]
-        
-        try:
-            self.cursor.execute("""
-                SELECT * FROM audit_logs 
-                ORDER BY timestamp DESC 
-                LIMIT %s
-            """, (limit,))
-            return self.cursor.fetchall()
-        except Exception as e:
-            logger.error(f"Error getting audit logs: {e}")
-            return []
+        return list(islice(reversed(self.audit_logs), limit))
 
-    def close(self):
-        """Close database connection"""
-        if self.is_connected and self.conn:
-            self.cursor.close()
-            self.conn.close()
-            logger.info("✅ Database connection closed")
+    # ========== COMPOSITE OPERATIONS ==========
+
+    def approve_registration(self, telegram_id: int, admin_id: int) -> bool:
+        """Approve a user, credit signup bonuses and audit it"""
+        if not self.update_user_status(telegram_id, 'APPROVED'):
+            return False
+        self.add_registration_bonus(telegram_id)
+        # No-op unless the user signed up with a referral code
+        self.process_referral_bonus(telegram_id)
+        self.log_audit(
+            action='USER_APPROVED',
+            actor='ADMIN',
+            actor_id=admin_id,
+            target_user=telegram_id,
+            description=f"User {telegram_id} approved with ${REGISTRATION_BONUS} bonus"
+        )
+        return True
 
 # Initialize database
 db = DatabaseManager()
 
+# Blocking DB calls run on worker threads instead of the event loop; one
+# worker per pooled connection so callers never hit an empty pool. The
+# in-memory store is not thread-safe, so it keeps a single worker.
+db_executor = ThreadPoolExecutor(
+    max_workers=DB_POOL_MAX if db.is_connected else 1, thread_name_prefix="db"
+)
+
+async def run_db(func, *args, **kwargs):
+    """Run a blocking database call on the DB worker thread"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, functools.partial(func, *args, **kwargs))
+
 # =========================
 # SECURITY UTILITIES
 # =========================
@@ -1116,32 +1938,49 @@ db = DatabaseManager()
 class SecurityUtils:
     """Security and validation utilities"""
     
+    EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+    PHONE_RE = re.compile(r'^\+?[1-9]\d{1,14}$')
+    OTP_RE = re.compile(rf'^[0-9]{{{OTP_LENGTH}}}$')
+    
+    @staticmethod
+    def _scrypt(password: str, salt: bytes) -> bytes:
+        """Derive the scrypt key for a password and salt"""
+        return hashlib.scrypt(password.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P)
+    
     @staticmethod
     def hash_password(password: str) -> str:
-        """Hash password"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Hash password as 'scrypt$<salt hex>$<key hex>'"""
+        salt = secrets.token_bytes(SCRYPT_SALT_BYTES)
+        return f"scrypt${salt.hex()}${SecurityUtils._scrypt(password, salt).hex()}"
     
     @staticmethod
     def verify_password(password: str, hashed: str) -> bool:
-        """Verify password"""
-        return SecurityUtils.hash_password(password) == hashed
+        """Verify password (constant-time comparison)"""
+        if hashed.startswith("scrypt$"):
+            _, salt, key = hashed.split("$")
+            return hmac.compare_digest(SecurityUtils._scrypt(password, bytes.fromhex(salt)).hex(), key)
+        # Unsalted SHA-256 hashes stored before scrypt
+        return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), hashed)
     
     @staticmethod
     def generate_otp() -> str:
         """Generate 6-digit OTP"""
-        return ''.join([str(random.randint(0, 9)) for _ in range(OTP_LENGTH)])
+        return f"{secrets.randbelow(10 ** OTP_LENGTH):0{OTP_LENGTH}d}"
     
     @staticmethod
     def validate_email(email: str) -> bool:
         """Validate email format"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return SecurityUtils.EMAIL_RE.match(email) is not None
     
     @staticmethod
     def validate_phone(phone: str) -> bool:
         """Validate phone number"""
-        pattern = r'^\+?[1-9]\d{1,14}$'
-        return bool(re.match(pattern, phone))
+        return SecurityUtils.PHONE_RE.match(phone) is not None
+    
+    @staticmethod
+    def validate_otp(otp: str) -> bool:
+        """Validate OTP format"""
+        return SecurityUtils.OTP_RE.match(otp) is not None
     
     @staticmethod
     def validate_name(name: str) -> bool:
@@ -1154,12 +1993,12 @@ class SecurityUtils:
         try:
             amount = Decimal(amount)
             if amount <= 0:
-                return False, Decimal('0'), "Amount must be greater than 0"
-            if amount > 1000000:
-                return False, Decimal('0'), "Amount cannot exceed $1,000,000"
+                return False, ZERO, "Amount must be greater than 0"
+            if amount > MAX_AMOUNT:
+                return False, ZERO, "Amount cannot exceed $1,000,000"
             return True, amount, "Valid"
-        except:
-            return False, Decimal('0'), "Invalid amount format"
+        except InvalidOperation:
+            return False, ZERO, "Invalid amount format"
     
     @staticmethod
     def mask_email(email: str) -> str:
@@ -1167,11 +2006,8 @@ class SecurityUtils:
         if not email or '@' not in email:
             return email
         local, domain = email.split('@')
-        if len(local) <= 2:
-            masked = local[0] + '*' * (len(local) - 1)
-        else:
-            masked = local[:2] + '*' * (len(local) - 2)
-        return f"{masked}@{domain}"
+        keep = 1 if len(local) <= 2 else 2
+        return f"{local[:keep]}{MASK_STARS[:len(local) - keep]}@{domain}"
     
     @staticmethod
     def mask_phone(phone: str) -> str:
@@ -1179,8 +2015,8 @@ class SecurityUtils:
         if not phone:
             return phone
         if len(phone) <= 4:
-            return '*' * len(phone)
-        return phone[:3] + '*' * (len(phone) - 5) + phone[-2:]
+            return MASK_STARS[:len(phone)]
+        return f"{phone[:3]}{MASK_STARS[:len(phone) - 5]}{phone[-2:]}"
 
 # =========================
 # EMAIL SERVICE
@@ -1192,7 +2028,7 @@ class EmailService:
     @staticmethod
     async def send_otp(email: str, otp: str, name: str) -> Tuple[bool, str]:
         """Simulate sending OTP email"""
-        logger.info(f"📧 SIMULATED EMAIL to {email}: OTP {otp} for {name}")
+        logger.info("📧 SIMULATED EMAIL to %s: OTP %s for %s", email, otp, name)
         return True, "OTP sent (simulated)"
 
 # =========================
@@ -1201,46 +2037,93 @@ class EmailService:
 
 def is_admin(user_id: int) -> bool:
     """Check if user is admin"""
-    return user_id == ADMIN_ID
-
-def get_main_menu(is_approved: bool = True) -> ReplyKeyboardMarkup:
-    """Get main menu keyboard"""
-    if is_approved:
-        keyboard = [
-            ["💰 My Savings", "📈 Savings Plans"],
-            ["➕ Add Funds", "➖ Withdraw"],
-            ["📜 History", "📞 Support & About"]
-        ]
-    else:
-        keyboard = [["⏳ Pending Approval"]]
-    
-    return ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
+    return user_id in ADMIN_IDS
+
+def admin_only(func):
+    """Reject non-admin updates before the wrapped handler runs"""
+    @functools.wraps(func)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE, *args, **kwargs):
+        user = update.effective_user
+        if user is None or not is_admin(user.id):
+            if update.callback_query:
+                await update.callback_query.answer("❌ Unauthorized.")
+            elif update.message:
+                await update.message.reply_text("❌ Unauthorized.")
+            return
+        return await func(update, context, *args, **kwargs)
+    return wrapper
+
+@functools.lru_cache(maxsize=1)
+def _ny_clock_for_minute(minute_bucket: int) -> Tuple[str, bool]:
+    """Cache the NY wall-clock string and banking-hours flag for one minute bucket"""
+    now = datetime.now(NY_TZ)
+    return now.strftime('%I:%M %p'), BANKING_OPEN_HOUR <= now.hour < BANKING_CLOSE_HOUR
+
+def ny_clock() -> Tuple[str, bool]:
+    """Current NY time text and whether banking is open, computed once a minute"""
+    return _ny_clock_for_minute(int(time.time() // 60))
+
+# Keyboards are immutable, so they are built once and shared
+MAIN_MENU = ReplyKeyboardMarkup([
+    ["💰 My Savings", "📈 Savings Plans"],
+    ["➕ Add Funds", "➖ Withdraw"],
+    ["📜 History", "📞 Support & About"]
+], resize_keyboard=True)
+
+PENDING_MENU = ReplyKeyboardMarkup([["⏳ Pending Approval"]], resize_keyboard=True)
+
+ADMIN_MENU = ReplyKeyboardMarkup([
+    ["📋 Pending Users", "👥 All Users"],
+    ["💰 Pending Deposits", "💸 Pending Withdrawals"],
+    ["📊 Statistics", "📜 Audit Logs"]
+], resize_keyboard=True)
+
+CRYPTO_METHODS_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("₿ BTC", callback_data="method_btc")],
+    [InlineKeyboardButton("Ξ ETH", callback_data="method_eth")],
+    [InlineKeyboardButton("💲 USDT (ERC20)", callback_data="method_usdt")],
+    [InlineKeyboardButton("💲 USDC (ERC20)", callback_data="method_usdc")],
+    [InlineKeyboardButton("🔙 Cancel", callback_data="method_cancel")]
+])
+
+SUPPORT_BUTTON = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📞 Contact Support", url=f"https://t.me/{SUPPORT_USERNAME}")]
+])
+
+REFERRAL_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("⏭️ Skip Referral", callback_data="skip_referral")],
+    [InlineKeyboardButton("❌ Cancel", callback_data="cancel_registration")]
+])
+
+SAVINGS_CONFIRM_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("✅ Confirm", callback_data="confirm_savings"),
+        InlineKeyboardButton("❌ Cancel", callback_data="cancel_savings")
+    ]
+])
+
+USER_STATUS_ICONS = {'PENDING': '⏳', 'APPROVED': '✅', 'REJECTED': '❌'}
+TX_STATUS_ICONS = {'PENDING': '⏳', 'COMPLETED': '✅', 'REJECTED': '❌'}
+TX_TYPE_ICONS = {'DEPOSIT': '➕', 'WITHDRAW': '➖', 'SAVINGS_CREATED': '📈', 'INTEREST': '🎁'}
 
 def get_crypto_methods_keyboard() -> InlineKeyboardMarkup:
     """Get crypto methods keyboard"""
-    keyboard = [
-        [InlineKeyboardButton("₿ BTC", callback_data="method_btc")],
-        [InlineKeyboardButton("Ξ ETH", callback_data="method_eth")],
-        [InlineKeyboardButton("💲 USDT (ERC20)", callback_data="method_usdt")],
-        [InlineKeyboardButton("💲 USDC (ERC20)", callback_data="method_usdc")],
-        [InlineKeyboardButton("🔙 Cancel", callback_data="method_cancel")]
-    ]
-    return InlineKeyboardMarkup(keyboard)
+    return CRYPTO_METHODS_KEYBOARD
+
+CRYPTO_ADDRESSES = {
+    'btc': BTC_ADDRESS,
+    'eth': ETH_ADDRESS,
+    'usdt': USDT_ADDRESS,
+    'usdc': USDC_ADDRESS
+}
 
 def get_crypto_address(currency: str) -> str:
     """Get crypto address for currency"""
-    addresses = {
-        'btc': BTC_ADDRESS,
-        'eth': ETH_ADDRESS,
-        'usdt': USDT_ADDRESS,
-        'usdc': USDC_ADDRESS
-    }
-    return addresses.get(currency.lower(), "Address not available")
+    return CRYPTO_ADDRESSES.get(currency.lower(), "Address not available")
 
 def get_support_button() -> InlineKeyboardMarkup:
     """Get support contact button"""
-    keyboard = [[InlineKeyboardButton("📞 Contact Support", url=f"https://t.me/{SUPPORT_USERNAME}")]]
-    return InlineKeyboardMarkup(keyboard)
+    return SUPPORT_BUTTON
 
 # =========================
 # START HANDLER
@@ -1248,6 +2131,7 @@ def get_support_button() -> InlineKeyboardMarkup:
 
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /start command"""
+    reply = update.message.reply_text
     user = update.effective_user
     user_id = user.id
     
@@ -1257,7 +2141,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     # Check if user exists
-    db_user = db.get_user(user_id)
+    db_user = await run_db(db.get_user, user_id)
     
     if not db_user:
         # New user - show welcome and ask for referral
@@ -1278,7 +2162,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
             "👇 <b>To begin, please answer a few questions.</b>"
         )
         
-        await update.message.reply_text(
+        await reply(
             welcome_text,
             parse_mode=ParseMode.HTML
         )
@@ -1288,14 +2172,14 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
     elif db_user['status'] == 'PENDING':
         if not db_user.get('is_email_verified', False):
-            await update.message.reply_text(
+            await reply(
                 "📧 <b>Email Verification Required</b>\n\n"
                 "Please check your email for OTP code.\n\n"
                 "Use <code>/verify &lt;code&gt;</code> to verify your email.",
                 parse_mode=ParseMode.HTML
             )
         else:
-            await update.message.reply_text(
+            await reply(
                 "⏳ <b>Account Pending Approval</b>\n\n"
                 "Your registration is under review by our admin team.\n"
                 "You'll be notified within 24-48 hours.",
@@ -1306,7 +2190,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await show_user_dashboard(update, context, db_user)
     
     elif db_user['status'] == 'REJECTED':
-        await update.message.reply_text(
+        await reply(
             "❌ <b>Registration Declined</b>\n\n"
             "Your account registration has been rejected.\n\n"
             "Please contact customer support for assistance.",
@@ -1316,11 +2200,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def ask_referral(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Ask for referral code"""
-    keyboard = [
-        [InlineKeyboardButton("⏭️ Skip Referral", callback_data="skip_referral")],
-        [InlineKeyboardButton("❌ Cancel", callback_data="cancel_registration")]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = REFERRAL_KEYBOARD
     
     await update.message.reply_text(
         "👥 <b>Referral Code</b>\n\n"
@@ -1340,25 +2220,25 @@ async def ask_referral(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def handle_referral(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle referral code input"""
+    reply = update.message.reply_text
     referral_code = update.message.text.strip().upper() if update.message.text else None
     
     if referral_code:
         # Validate referral code
-        referrer = db.get_user_by_referral(referral_code)
+        referrer = await run_db(db.get_user_by_referral, referral_code)
         if referrer:
             context.user_data['referred_by'] = referrer['telegram_id']
-            await update.message.reply_text("✅ Referral code accepted!")
+            await reply("✅ Referral code accepted!")
         else:
-            await update.message.reply_text(
-                "❌ Invalid referral code. Please try again or skip.",
-                parse_mode=ParseMode.HTML
+            await reply(
+                "❌ Invalid referral code. Please try again or skip."
             )
             return REFERRAL
     
     context.user_data['referral_processed'] = True
     
     # Start full name collection
-    await update.message.reply_text(
+    await reply(
         "📝 <b>Step 1/4: Full Name</b>\n\n"
         "Please enter your full legal name:\n"
         "• Example: <code>John Smith</code>\n"
@@ -1393,10 +2273,11 @@ async def referral_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def register_fullname(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Process full name"""
+    reply = update.message.reply_text
     full_name = update.message.text.strip()
     
     if not SecurityUtils.validate_name(full_name):
-        await update.message.reply_text(
+        await reply(
             "❌ Invalid name.\n"
             "Please enter 2-100 characters:\n"
             "Example: <code>John Smith</code>",
@@ -1406,7 +2287,7 @@ async def register_fullname(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     context.user_data['full_name'] = full_name
     
-    await update.message.reply_text(
+    await reply(
         "📞 <b>Step 2/4: Phone Number</b>\n\n"
         "Please enter your phone number:\n"
         "• Include country code\n"
@@ -1418,10 +2299,11 @@ async def register_fullname(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def register_phone(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Process phone number"""
+    reply = update.message.reply_text
     phone = update.message.text.strip()
     
     if not SecurityUtils.validate_phone(phone):
-        await update.message.reply_text(
+        await reply(
             "❌ Invalid phone number.\n"
             "Please use format: <code>+1234567890</code>",
             parse_mode=ParseMode.HTML
@@ -1430,7 +2312,7 @@ async def register_phone(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     context.user_data['phone'] = phone
     
-    await update.message.reply_text(
+    await reply(
         "📧 <b>Step 3/4: Email Address</b>\n\n"
         "Please enter your email address:\n"
         "• Example: <code>name@example.com</code>\n"
@@ -1443,10 +2325,11 @@ async def register_phone(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def register_email(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Process email and send OTP"""
+    reply = update.message.reply_text
     email = update.message.text.strip().lower()
     
     if not SecurityUtils.validate_email(email):
-        await update.message.reply_text(
+        await reply(
             "❌ Invalid email format.\n"
             "Please enter a valid email: <code>name@example.com</code>",
             parse_mode=ParseMode.HTML
@@ -1454,11 +2337,10 @@ async def register_email(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return EMAIL
     
     # Check if email exists
-    if db.get_user_by_email(email):
-        await update.message.reply_text(
+    if await run_db(db.email_exists, email):
+        await reply(
             "❌ This email is already registered.\n"
-            "Please use a different email address.",
-            parse_mode=ParseMode.HTML
+            "Please use a different email address."
         )
         return EMAIL
     
@@ -1471,10 +2353,11 @@ async def register_email(update: Update, context: ContextTypes.DEFAULT_TYPE):
     phone = context.user_data.get('phone')
     referred_by = context.user_data.get('referred_by')
     
-    # Temporary password (user will set later)
-    temp_password = SecurityUtils.hash_password(secrets.token_hex(8))
+    # Temporary password (user will set later); scrypt runs off the event loop
+    temp_password = await asyncio.to_thread(SecurityUtils.hash_password, secrets.token_hex(8))
     
-    success = db.create_user(
+    success = await run_db(
+        db.create_user,
         telegram_id=user_id,
         full_name=full_name,
         phone=phone,
@@ -1484,17 +2367,17 @@ async def register_email(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
     
     if not success:
-        await update.message.reply_text("❌ Registration failed. Please try again.")
+        await reply("❌ Registration failed. Please try again.")
         return ConversationHandler.END
     
     # Generate and send OTP
     otp = SecurityUtils.generate_otp()
-    db.save_otp(user_id, otp)
+    await run_db(db.save_otp, user_id, otp)
     
     success, message = await EmailService.send_otp(email, otp, full_name)
     
     if success:
-        await update.message.reply_text(
+        await reply(
             "✅ <b>Email Verification Required</b>\n\n"
             f"📧 Email: <code>{SecurityUtils.mask_email(email)}</code>\n\n"
             "A 6-digit OTP code has been sent to your email.\n\n"
@@ -1504,21 +2387,21 @@ async def register_email(update: Update, context: ContextTypes.DEFAULT_TYPE):
             parse_mode=ParseMode.HTML
         )
     else:
-        await update.message.reply_text(
+        await reply(
             f"❌ Failed to send email: {message}\n"
             "Please contact support.",
-            reply_markup=get_support_button(),
-            parse_mode=ParseMode.HTML
+            reply_markup=get_support_button()
         )
     
     return ConversationHandler.END
 
 async def verify_otp_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle /verify command"""
+    reply = update.message.reply_text
     user_id = update.effective_user.id
     
     if not context.args:
-        await update.message.reply_text(
+        await reply(
             "❌ Please provide OTP code.\n"
             "Usage: <code>/verify 123456</code>",
             parse_mode=ParseMode.HTML
@@ -1527,24 +2410,23 @@ async def verify_otp_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     
     otp = context.args[0].strip()
     
-    if not otp.isdigit() or len(otp) != OTP_LENGTH:
-        await update.message.reply_text(
+    if not SecurityUtils.validate_otp(otp):
+        await reply(
             f"❌ Invalid OTP format.\n"
-            f"Please enter {OTP_LENGTH}-digit numeric code.",
-            parse_mode=ParseMode.HTML
+            f"Please enter {OTP_LENGTH}-digit numeric code."
         )
         return
     
-    success, message = db.verify_otp(user_id, otp)
+    success, message = await run_db(db.verify_otp, user_id, otp)
     
     if success:
         # Get user data
-        user = db.get_user(user_id)
+        user = await run_db(db.get_user, user_id)
         
         # Notify admin
         await notify_admin_new_user(context.bot, user)
         
-        await update.message.reply_text(
+        await reply(
             "✅ <b>Email Verified!</b>\n\n"
             "Your email has been successfully verified.\n\n"
             "⏳ Your account is now pending admin approval.\n"
@@ -1554,15 +2436,24 @@ async def verify_otp_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
             parse_mode=ParseMode.HTML
         )
     else:
-        await update.message.reply_text(
-            f"❌ {message}",
-            parse_mode=ParseMode.HTML
-        )
+        await reply(f"❌ {message}")
 
 # =========================
 # ADMIN NOTIFICATION
 # =========================
 
+async def notify_user(bot, user_id: int, text: str, reply_markup=None):
+    """Send an HTML message to a user, logging (not raising) delivery failures"""
+    try:
+        await bot.send_message(
+            chat_id=user_id,
+            text=text,
+            parse_mode=ParseMode.HTML,
+            reply_markup=reply_markup
+        )
+    except Exception as e:
+        logger.error("Failed to notify user %s: %s", user_id, e)
+
 async def notify_admin_new_user(bot, user: Dict[str, Any]):
     """Notify admin about new user registration"""
     keyboard = [
@@ -1599,107 +2490,99 @@ async def notify_admin_new_user(bot, user: Dict[str, Any]):
             reply_markup=reply_markup
         )
     except Exception as e:
-        logger.error(f"Failed to notify admin: {e}")
+        logger.error("Failed to notify admin: %s", e)
 
 # =========================
 # ADMIN CALLBACK HANDLER
 # =========================
 
+# User notifications, filled from the user row with str.format_map
+APPROVAL_WELCOME_TEMPLATE = (
+    "✅ <b>━━━━━━━━━━━━━━━━━━━━</b>\n"
+    "     ACCOUNT APPROVED!\n"
+    "<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
+    "👤 Welcome, <b>{full_name}</b>!\n\n"
+    "💰 <b>$5.00 registration bonus</b> has been added to your account.\n\n"
+    "📋 <b>Your Client ID:</b> <code>{telegram_id}</code>\n\n"
+    "<b>Available Services:</b>\n"
+    "• 💰 My Savings - Check balance\n"
+    "• 📈 Savings Plans - Start saving\n"
+    "• ➕ Add Funds - Deposit crypto\n"
+    "• ➖ Withdraw - Request withdrawal\n"
+    "• 📜 History - View transactions\n\n"
+    "Use the menu below to get started!"
+)
+
+REJECTION_NOTICE_TEMPLATE = (
+    "❌ <b>━━━━━━━━━━━━━━━━━━━━</b>\n"
+    "     REGISTRATION UPDATE\n"
+    "<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
+    "Dear {full_name},\n\n"
+    "Unfortunately, your account registration has been rejected.\n\n"
+    "<b>Possible reasons:</b>\n"
+    "• Incomplete information\n"
+    "• Unable to verify identity\n"
+    "• Duplicate account\n\n"
+    "📞 Please contact customer support for assistance."
+)
+
+@admin_only
 async def admin_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle admin callbacks"""
     query = update.callback_query
     await query.answer()
     
-    if not is_admin(query.from_user.id):
-        await query.edit_message_text("❌ Unauthorized.")
+    # admin_<action>_<user id>; deposit/withdrawal callbacks carry a tx id instead
+    _, action, target = query.data.split('_', 2)
+    if action == 'users':
+        # The user list pages on a created_at_telegramid cursor, not an id
+        await show_next_user_page(query, target)
         return
-    
-    data = query.data
-    
-    if data.startswith("admin_approve_"):
-        user_id = int(data.replace("admin_approve_", ""))
-        await approve_user(query, context, user_id)
-    
-    elif data.startswith("admin_reject_"):
-        user_id = int(data.replace("admin_reject_", ""))
-        await reject_user(query, context, user_id)
-    
-    elif data.startswith("admin_view_"):
-        user_id = int(data.replace("admin_view_", ""))
-        await view_user_details(query, user_id)
+    handler = ADMIN_ACTIONS.get(action)
+    if handler and target.isdigit():
+        await handler(query, context, int(target))
 
 async def approve_user(query, context, user_id: int):
     """Approve user registration"""
-    user = db.get_user(user_id)
+    user = await run_db(db.get_user, user_id)
     if not user:
         await query.edit_message_text(f"❌ User {user_id} not found.")
         return
     
-    # Update status
-    if db.update_user_status(user_id, 'APPROVED'):
-        # Add registration bonus
-        db.add_registration_bonus(user_id)
-        
-        # Process referral bonus if any
-        if user.get('referred_by'):
-            db.process_referral_bonus(user_id)
-        
-        # Log audit
-        db.log_audit(
-            action='USER_APPROVED',
-            actor='ADMIN',
-            actor_id=ADMIN_ID,
-            target_user=user_id,
-            description=f"User {user_id} approved with $5 bonus"
-        )
-        
-        # Notify user
-        try:
-            await context.bot.send_message(
-                chat_id=user_id,
-                text=(
-                    "✅ <b>━━━━━━━━━━━━━━━━━━━━</b>\n"
-                    "     ACCOUNT APPROVED!\n"
-                    "<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
-                    f"👤 Welcome, <b>{user['full_name']}</b>!\n\n"
-                    f"💰 <b>$5.00 registration bonus</b> has been added to your account.\n\n"
-                    f"📋 <b>Your Client ID:</b> <code>{user['telegram_id']}</code>\n\n"
-                    f"<b>Available Services:</b>\n"
-                    f"• 💰 My Savings - Check balance\n"
-                    f"• 📈 Savings Plans - Start saving\n"
-                    f"• ➕ Add Funds - Deposit crypto\n"
-                    f"• ➖ Withdraw - Request withdrawal\n"
-                    f"• 📜 History - View transactions\n\n"
-                    f"Use the menu below to get started!"
-                ),
-                parse_mode=ParseMode.HTML,
-                reply_markup=get_main_menu(True)
-            )
-        except Exception as e:
-            logger.error(f"Failed to notify user {user_id}: {e}")
-        
-        await query.edit_message_text(
-            f"✅ <b>User Approved</b>\n\n"
-            f"👤 Name: {user['full_name']}\n"
-            f"🆔 ID: <code>{user_id}</code>\n"
-            f"💰 $5.00 bonus added\n\n"
-            f"User has been notified.",
-            parse_mode=ParseMode.HTML
+    # Update status, credit bonuses and audit in one transaction
+    if await run_db(db.approve_registration, user_id, ADMIN_ID):
+        # Notify the user, update the admin's message and refresh stats concurrently
+        await asyncio.gather(
+            notify_user(
+                context.bot,
+                user_id,
+                text=APPROVAL_WELCOME_TEMPLATE.format_map(user),
+                reply_markup=MAIN_MENU
+            ),
+            query.edit_message_text(
+                f"✅ <b>User Approved</b>\n\n"
+                f"👤 Name: {user['full_name']}\n"
+                f"🆔 ID: <code>{user_id}</code>\n"
+                f"💰 $5.00 bonus added\n\n"
+                f"User has been notified.",
+                parse_mode=ParseMode.HTML
+            ),
+            run_db(db.refresh_admin_overview)
         )
     else:
         await query.edit_message_text(f"❌ Failed to approve user {user_id}")
 
 async def reject_user(query, context, user_id: int):
     """Reject user registration"""
-    user = db.get_user(user_id)
+    user = await run_db(db.get_user, user_id)
     if not user:
         await query.edit_message_text(f"❌ User {user_id} not found.")
         return
     
     # Update status
-    if db.update_user_status(user_id, 'REJECTED'):
+    if await run_db(db.update_user_status, user_id, 'REJECTED'):
         # Log audit
-        db.log_audit(
+        db.queue_audit(
             action='USER_REJECTED',
             actor='ADMIN',
             actor_id=ADMIN_ID,
@@ -1707,52 +2590,35 @@ async def reject_user(query, context, user_id: int):
             description=f"User {user_id} rejected"
         )
         
-        # Notify user
-        try:
-            await context.bot.send_message(
-                chat_id=user_id,
-                text=(
-                    "❌ <b>━━━━━━━━━━━━━━━━━━━━</b>\n"
-                    "     REGISTRATION UPDATE\n"
-                    "<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
-                    f"Dear {user['full_name']},\n\n"
-                    "Unfortunately, your account registration has been rejected.\n\n"
-                    "<b>Possible reasons:</b>\n"
-                    "• Incomplete information\n"
-                    "• Unable to verify identity\n"
-                    "• Duplicate account\n\n"
-                    "📞 Please contact customer support for assistance."
-                ),
-                parse_mode=ParseMode.HTML,
+        # Notify the user, update the admin's message and refresh stats concurrently
+        await asyncio.gather(
+            notify_user(
+                context.bot,
+                user_id,
+                text=REJECTION_NOTICE_TEMPLATE.format_map(user),
                 reply_markup=get_support_button()
-            )
-        except Exception as e:
-            logger.error(f"Failed to notify user {user_id}: {e}")
-        
-        await query.edit_message_text(
-            f"❌ <b>User Rejected</b>\n\n"
-            f"👤 Name: {user['full_name']}\n"
-            f"🆔 ID: <code>{user_id}</code>\n\n"
-            f"User has been notified.",
-            parse_mode=ParseMode.HTML
+            ),
+            query.edit_message_text(
+                f"❌ <b>User Rejected</b>\n\n"
+                f"👤 Name: {user['full_name']}\n"
+                f"🆔 ID: <code>{user_id}</code>\n\n"
+                f"User has been notified.",
+                parse_mode=ParseMode.HTML
+            ),
+            run_db(db.refresh_admin_overview)
         )
     else:
         await query.edit_message_text(f"❌ Failed to reject user {user_id}")
 
-async def view_user_details(query, user_id: int):
+async def view_user_details(query, context, user_id: int):
     """View user details"""
-    user = db.get_user(user_id)
-    account = db.get_account(user_id)
+    user = await run_db(db.get_user_with_account, user_id)
     
     if not user:
         await query.edit_message_text(f"❌ User {user_id} not found.")
         return
     
-    status_icon = {
-        'PENDING': '⏳',
-        'APPROVED': '✅',
-        'REJECTED': '❌'
-    }.get(user['status'], '❓')
+    status_icon = USER_STATUS_ICONS.get(user['status'], '❓')
     
     message = (
         f"👤 <b>━━━━━━━━━━━━━━━━━━━━</b>\n"
@@ -1764,9 +2630,9 @@ async def view_user_details(query, user_id: int):
         f"<b>Email:</b> {SecurityUtils.mask_email(user['email'])}\n"
         f"<b>Status:</b> {status_icon} {user['status']}\n"
         f"<b>Email Verified:</b> {'✅ Yes' if user.get('is_email_verified') else '❌ No'}\n"
-        f"<b>Balance:</b> ${account['balance'] if account else 0:.2f}\n"
-        f"<b>Available:</b> ${account['available_balance'] if account else 0:.2f}\n"
-        f"<b>Locked:</b> ${account['locked_balance'] if account else 0:.2f}\n"
+        f"<b>Balance:</b> ${user['balance'] or 0:.2f}\n"
+        f"<b>Available:</b> ${user['available_balance'] or 0:.2f}\n"
+        f"<b>Locked:</b> ${user['locked_balance'] or 0:.2f}\n"
         f"<b>Referral Code:</b> <code>{user.get('referral_code', 'N/A')}</code>\n"
         f"<b>Referred By:</b> {user.get('referred_by', 'None')}\n"
         f"<b>Registered:</b> {user['created_at'].strftime('%Y-%m-%d %H:%M')}\n\n"
@@ -1778,35 +2644,39 @@ async def view_user_details(query, user_id: int):
         parse_mode=ParseMode.HTML
     )
 
+# Callback action -> handler(query, context, user_id)
+ADMIN_ACTIONS = {
+    'approve': approve_user,
+    'reject': reject_user,
+    'view': view_user_details,
+}
+
 # =========================
 # ADMIN PANEL
 # =========================
 
+@admin_only
 async def show_admin_panel(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show admin control panel"""
     # Get statistics
-    all_users = db.get_all_users()
-    pending_users = [u for u in all_users if u['status'] == 'PENDING']
-    approved_users = [u for u in all_users if u['status'] == 'APPROVED']
-    
-    total_balance = sum(float(u.get('balance', 0)) for u in all_users if u.get('balance'))
-    
-    pending_deposits = db.get_pending_transactions('DEPOSIT')
-    pending_withdrawals = db.get_pending_transactions('WITHDRAW')
+    stats = await run_db(db.get_admin_overview)
+    if stats is None:
+        await update.message.reply_text("❌ Could not load statistics.", reply_markup=ADMIN_MENU)
+        return
     
     message = (
         "🔐 <b>━━━━━━━━━━━━━━━━━━━━</b>\n"
         "     ADMIN CONTROL PANEL\n"
         "<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
         f"📊 <b>System Overview</b>\n"
-        f"• Total Users: <code>{len(all_users)}</code>\n"
-        f"• Pending: <code>{len(pending_users)}</code>\n"
-        f"• Approved: <code>{len(approved_users)}</code>\n"
-        f"• Total Balance: <code>${total_balance:.2f}</code>\n\n"
+        f"• Total Users: <code>{stats.total_users}</code>\n"
+        f"• Pending: <code>{stats.pending_users}</code>\n"
+        f"• Approved: <code>{stats.approved_users}</code>\n"
+        f"• Total Balance: <code>${stats.total_balance:.2f}</code>\n\n"
         f"⏳ <b>Pending Actions</b>\n"
-        f"• Deposits: <code>{len(pending_deposits)}</code>\n"
-        f"• Withdrawals: <code>{len(pending_withdrawals)}</code>\n\n"
-        f"🕐 <b>NY Time:</b> {datetime.now(NY_TZ).strftime('%I:%M %p')}\n\n"
+        f"• Deposits: <code>{stats.pending_deposits}</code>\n"
+        f"• Withdrawals: <code>{stats.pending_withdrawals}</code>\n\n"
+        f"🕐 <b>NY Time:</b> {ny_clock()[0]}\n\n"
         f"<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
         f"<b>Commands:</b>\n"
         f"/users - View all users\n"
@@ -1816,95 +2686,108 @@ async def show_admin_panel(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"/stats - Detailed statistics"
     )
     
-    keyboard = [
-        ["📋 Pending Users", "👥 All Users"],
-        ["💰 Pending Deposits", "💸 Pending Withdrawals"],
-        ["📊 Statistics", "📜 Audit Logs"]
-    ]
-    reply_markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
-    
     await update.message.reply_text(
         message,
-        reply_markup=reply_markup,
+        reply_markup=ADMIN_MENU,
         parse_mode=ParseMode.HTML
     )
 
+@admin_only
 async def admin_pending_users(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show pending users for admin"""
-    if not is_admin(update.effective_user.id):
-        await update.message.reply_text("❌ Unauthorized.")
-        return
+    reply = update.message.reply_text
     
-    pending = db.get_pending_users()
+    pending = await run_db(db.get_pending_users)
     
     if not pending:
-        await update.message.reply_text("✅ No pending users.")
+        await reply("✅ No pending users.")
         return
     
-    message = "⏳ <b>Pending Users</b>\n\n"
+    parts = ["⏳ <b>Pending Users</b>\n\n"]
     keyboard = []
     
     for user in pending[:5]:
-        message += (
-            f"👤 <b>{user['full_name']}</b>\n"
-            f"🆔 <code>{user['telegram_id']}</code>\n"
-            f"📧 {SecurityUtils.mask_email(user['email'])}\n"
-            f"📅 {user['created_at'].strftime('%Y-%m-%d')}\n"
+        parts.append(
+            f"👤 <b>{user.full_name}</b>\n"
+            f"🆔 <code>{user.telegram_id}</code>\n"
+            f"📧 {SecurityUtils.mask_email(user.email)}\n"
+            f"📅 {user.created_at.strftime('%Y-%m-%d')}\n"
             "━━━━━━━━━━━━━━\n"
         )
         
         keyboard.append([
-            InlineKeyboardButton(f"✅ Approve {user['full_name'][:10]}", 
-                               callback_data=f"admin_approve_{user['telegram_id']}"),
+            InlineKeyboardButton(f"✅ Approve {user.full_name[:10]}", 
+                               callback_data=f"admin_approve_{user.telegram_id}"),
             InlineKeyboardButton("❌ Reject", 
-                               callback_data=f"admin_reject_{user['telegram_id']}")
+                               callback_data=f"admin_reject_{user.telegram_id}")
         ])
     
     if len(pending) > 5:
-        message += f"... and {len(pending) - 5} more\n"
+        parts.append(f"... and {len(pending) - 5} more\n")
     
     reply_markup = InlineKeyboardMarkup(keyboard)
     
-    await update.message.reply_text(
-        message,
+    await reply(
+        "".join(parts),
         reply_markup=reply_markup,
         parse_mode=ParseMode.HTML
     )
 
+@admin_only
 async def admin_all_users(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show all users for admin"""
-    if not is_admin(update.effective_user.id):
-        await update.message.reply_text("❌ Unauthorized.")
-        return
+    reply = update.message.reply_text
+    
+    message, reply_markup = await build_user_page()
     
-    users = db.get_all_users()
+    await reply(
+        message,
+        reply_markup=reply_markup,
+        parse_mode=ParseMode.HTML
+    )
+
+async def build_user_page(after: Optional[Tuple[datetime, int]] = None) -> Tuple[str, Optional[InlineKeyboardMarkup]]:
+    """Render one page of the user list, with a Next button carrying the keyset cursor"""
+    # One row past the page tells whether another page exists
+    users, total = await asyncio.gather(
+        run_db(db.get_all_users, ADMIN_USERS_PAGE_SIZE + 1, after),
+        run_db(db.count_users)
+    )
     
     if not users:
-        await update.message.reply_text("📭 No users found.")
-        return
+        return "📭 No users found.", None
     
-    message = "👥 <b>All Users</b>\n\n"
+    page = users[:ADMIN_USERS_PAGE_SIZE]
+    parts = [f"👥 <b>All Users</b> ({total} total)\n\n"]
     
-    for user in users[:10]:
-        status_icon = {
-            'PENDING': '⏳',
-            'APPROVED': '✅',
-            'REJECTED': '❌'
-        }.get(user['status'], '❓')
+    for user in page:
+        status_icon = USER_STATUS_ICONS.get(user.status, '❓')
         
-        message += (
-            f"{status_icon} <b>{user['full_name']}</b>\n"
-            f"🆔 <code>{user['telegram_id']}</code>\n"
-            f"💰 ${user.get('balance', 0):.2f}\n"
-            f"📅 {user['created_at'].strftime('%Y-%m-%d')}\n"
+        parts.append(
+            f"{status_icon} <b>{user.full_name}</b>\n"
+            f"🆔 <code>{user.telegram_id}</code>\n"
+            f"💰 ${user.balance or 0:.2f}\n"
+            f"📅 {user.created_at.strftime('%Y-%m-%d')}\n"
             "━━━━━━━━━━━━━━\n"
         )
     
-    if len(users) > 10:
-        message += f"... and {len(users) - 10} more\n"
+    reply_markup = None
+    if len(users) > ADMIN_USERS_PAGE_SIZE:
+        last = page[-1]
+        reply_markup = InlineKeyboardMarkup([[InlineKeyboardButton(
+            "➡️ Next",
+            callback_data=f"admin_users_{last.created_at.isoformat()}_{last.telegram_id}"
+        )]])
     
-    await update.message.reply_text(
+    return "".join(parts), reply_markup
+
+async def show_next_user_page(query, cursor: str):
+    """Replace the user list message with the page after `cursor` (created_at_telegramid)"""
+    created_at, _, telegram_id = cursor.rpartition('_')
+    message, reply_markup = await build_user_page((datetime.fromisoformat(created_at), int(telegram_id)))
+    await query.edit_message_text(
         message,
+        reply_markup=reply_markup,
         parse_mode=ParseMode.HTML
     )
 
@@ -1914,24 +2797,9 @@ async def admin_all_users(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def show_user_dashboard(update: Update, context: ContextTypes.DEFAULT_TYPE, user: Dict[str, Any]):
     """Show user main dashboard"""
-    account = db.get_account(user['telegram_id'])
-    
-    # Calculate pending interest
-    pending_interest = db.calculate_and_add_interest(user['telegram_id'])
-    
-    if pending_interest > 0 and db.is_connected:
-        # Apply interest to account
-        db.cursor.execute("""
-            UPDATE accounts 
-            SET balance = balance + %s,
-                available_balance = available_balance + %s,
-                total_interest_earned = total_interest_earned + %s
-            WHERE user_telegram_id = %s
-        """, (pending_interest, pending_interest, pending_interest, user['telegram_id']))
-        db.conn.commit()
-    
-    # Refresh account
-    account = db.get_account(user['telegram_id'])
+    # Apply pending interest, then read the refreshed account
+    account = await run_db(db.apply_pending_interest_and_fetch, user['telegram_id'])
+    ny_time, banking_open = ny_clock()
     
     message = (
         f"🏦 <b>━━━━━━━━━━━━━━━━━━━━</b>\n"
@@ -1945,14 +2813,14 @@ async def show_user_dashboard(update: Update, context: ContextTypes.DEFAULT_TYPE
         f"• Locked: <code>${account['locked_balance']:.2f}</code>\n"
         f"• Interest Earned: <code>${account['total_interest_earned']:.2f}</code>\n\n"
         f"📊 <b>Today</b>\n"
-        f"• NY Time: {datetime.now(NY_TZ).strftime('%I:%M %p')}\n"
-        f"• Banking: {'🟢 Open' if 8 <= datetime.now(NY_TZ).hour < 16 else '🔴 Closed'}\n\n"
+        f"• NY Time: {ny_time}\n"
+        f"• Banking: {'🟢 Open' if banking_open else '🔴 Closed'}\n\n"
         f"Select an option below:"
     )
     
     await update.message.reply_text(
         message,
-        reply_markup=get_main_menu(True),
+        reply_markup=MAIN_MENU,
         parse_mode=ParseMode.HTML
     )
 
@@ -1962,34 +2830,22 @@ async def show_user_dashboard(update: Update, context: ContextTypes.DEFAULT_TYPE
 
 async def my_savings(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle My Savings button"""
+    reply = update.message.reply_text
     user_id = update.effective_user.id
-    user = db.get_user(user_id)
+    user = await run_db(db.get_user, user_id)
     
     if not user or user['status'] != 'APPROVED':
-        await update.message.reply_text(
+        await reply(
             "⏳ Your account is pending approval.",
-            reply_markup=get_main_menu(False)
+            reply_markup=PENDING_MENU
         )
         return
     
-    account = db.get_account(user_id)
-    plans = db.get_user_savings_plans(user_id)
-    
-    # Calculate any pending interest
-    pending_interest = db.calculate_and_add_interest(user_id)
-    if pending_interest > 0 and db.is_connected:
-        # Apply interest
-        db.cursor.execute("""
-            UPDATE accounts 
-            SET balance = balance + %s,
-                available_balance = available_balance + %s,
-                total_interest_earned = total_interest_earned + %s
-            WHERE user_telegram_id = %s
-        """, (pending_interest, pending_interest, pending_interest, user_id))
-        db.conn.commit()
-        account = db.get_account(user_id)
+    # Apply any pending interest before reading balances
+    account = await run_db(db.apply_pending_interest_and_fetch, user_id)
+    plans = await run_db(db.get_user_savings_plans, user_id)
     
-    message = (
+    parts = [
         f"💰 <b>━━━━━━━━━━━━━━━━━━━━</b>\n"
         f"     MY SAVINGS\n"
         f"<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
@@ -1999,30 +2855,29 @@ async def my_savings(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"• Available: <code>${account['available_balance']:.2f}</code>\n"
         f"• Locked in Plans: <code>${account['locked_balance']:.2f}</code>\n\n"
         f"📈 <b>Savings Plans</b>\n"
-    )
+    ]
     
     if not plans:
-        message += "• You don't have any active savings plans.\n"
-        message += "• Use /savings to start a plan!\n"
+        parts.append(
+            "• You don't have any active savings plans.\n"
+            "• Use /savings to start a plan!\n"
+        )
     else:
         for plan in plans:
             status_icon = "🟢" if plan['status'] == 'ACTIVE' else "🔴"
-            progress = (datetime.now().date() - plan['start_date']).days
-            total_days = (plan['end_date'] - plan['start_date']).days
-            progress_pct = min(100, int((progress / total_days) * 100))
             
-            message += (
+            parts.append(
                 f"\n{status_icon} <b>{plan['plan_name']}</b>\n"
                 f"   Principal: <code>${plan['principal_amount']:.2f}</code>\n"
                 f"   Current: <code>${plan['current_value']:.2f}</code>\n"
                 f"   Interest: <code>${plan['interest_earned']:.2f}</code>\n"
-                f"   Progress: {progress}/{total_days} days ({progress_pct}%)\n"
+                f"   Progress: {plan['progress_days']}/{plan['total_days']} days ({plan['progress_pct']}%)\n"
             )
     
-    message += f"\n<b>━━━━━━━━━━━━━━━━━━━━</b>"
+    parts.append("\n<b>━━━━━━━━━━━━━━━━━━━━</b>")
     
-    await update.message.reply_text(
-        message,
+    await reply(
+        "".join(parts),
         parse_mode=ParseMode.HTML
     )
 
@@ -2032,27 +2887,30 @@ async def my_savings(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def savings_plans(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show available savings plans"""
+    reply = update.message.reply_text
     user_id = update.effective_user.id
-    user = db.get_user(user_id)
+    user = await run_db(db.get_user, user_id)
     
     if not user or user['status'] != 'APPROVED':
-        await update.message.reply_text(
+        await reply(
             "⏳ Your account is pending approval.",
-            reply_markup=get_main_menu(False)
+            reply_markup=PENDING_MENU
         )
         return
     
-    templates = db.get_savings_templates()
+    templates = await run_db(db.get_savings_templates)
     
-    message = "📈 <b>━━━━━━━━━━━━━━━━━━━━</b>\n"
-    message += "     SAVINGS PLANS\n"
-    message += "<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
+    parts = [
+        "📈 <b>━━━━━━━━━━━━━━━━━━━━</b>\n"
+        "     SAVINGS PLANS\n"
+        "<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
+    ]
     
     keyboard = []
     
     for template in templates:
         lock_icon = "🔒" if template['is_locked'] else "🔓"
-        message += (
+        parts.append(
             f"{lock_icon} <b>{template['name']}</b>\n"
             f"📝 {template['description']}\n"
             f"⏱️ Duration: {template['duration_days']} days\n"
@@ -2072,8 +2930,8 @@ async def savings_plans(update: Update, context: ContextTypes.DEFAULT_TYPE):
     keyboard.append([InlineKeyboardButton("🔙 Back", callback_data="back_to_menu")])
     reply_markup = InlineKeyboardMarkup(keyboard)
     
-    await update.message.reply_text(
-        message,
+    await reply(
+        "".join(parts),
         reply_markup=reply_markup,
         parse_mode=ParseMode.HTML
     )
@@ -2089,11 +2947,10 @@ async def plan_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     if query.data.startswith("plan_"):
         plan_id = int(query.data.replace("plan_", ""))
-        templates = db.get_savings_templates()
-        selected_plan = next((p for p in templates if p['id'] == plan_id), None)
+        selected_plan = await run_db(db.get_savings_template, plan_id)
         
         if selected_plan:
-            context.user_data['selected_plan'] = selected_plan
+            context.user_data['selected_plan_id'] = plan_id
             
             await query.edit_message_text(
                 f"💰 <b>{selected_plan['name']} Plan Selected</b>\n\n"
@@ -2111,20 +2968,22 @@ async def plan_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def savings_amount(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Process savings amount"""
+    reply = update.message.reply_text
     amount_str = update.message.text.strip()
     
     is_valid, amount, error = SecurityUtils.validate_amount(amount_str)
     if not is_valid:
-        await update.message.reply_text(f"❌ {error}\n\nPlease try again:")
+        await reply(f"❌ {error}\n\nPlease try again:")
         return SAVINGS_AMOUNT
     
-    selected_plan = context.user_data.get('selected_plan')
+    template_id = context.user_data.get('selected_plan_id')
+    selected_plan = template_id and await run_db(db.get_savings_template, template_id)
     if not selected_plan:
-        await update.message.reply_text("❌ Plan selection expired. Please start over.")
+        await reply("❌ Plan selection expired. Please start over.")
         return ConversationHandler.END
     
     if amount < selected_plan['min_amount']:
-        await update.message.reply_text(
+        await reply(
             f"❌ Minimum amount for {selected_plan['name']} is ${selected_plan['min_amount']:.2f}\n"
             f"Please enter a valid amount:"
         )
@@ -2132,15 +2991,15 @@ async def savings_amount(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # Check balance
     user_id = update.effective_user.id
-    account = db.get_account(user_id)
+    account = await run_db(db.get_account, user_id)
     
     if account['available_balance'] < amount:
-        await update.message.reply_text(
+        await reply(
             f"❌ <b>Insufficient Balance</b>\n\n"
             f"Your available balance: <code>${account['available_balance']:.2f}</code>\n"
             f"Required: <code>${amount:.2f}</code>\n\n"
             f"Please add funds first.",
-            reply_markup=get_main_menu(True),
+            reply_markup=MAIN_MENU,
             parse_mode=ParseMode.HTML
         )
         return ConversationHandler.END
@@ -2152,15 +3011,9 @@ async def savings_amount(update: Update, context: ContextTypes.DEFAULT_TYPE):
     total_interest = daily_interest * selected_plan['duration_days']
     final_amount = amount + total_interest
     
-    keyboard = [
-        [
-            InlineKeyboardButton("✅ Confirm", callback_data="confirm_savings"),
-            InlineKeyboardButton("❌ Cancel", callback_data="cancel_savings")
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = SAVINGS_CONFIRM_KEYBOARD
     
-    await update.message.reply_text(
+    await reply(
         f"✅ <b>Confirm Savings Plan</b>\n\n"
         f"📋 <b>Plan:</b> {selected_plan['name']}\n"
         f"💰 <b>Principal:</b> <code>${amount:.2f}</code>\n"
@@ -2185,45 +3038,18 @@ async def savings_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return ConversationHandler.END
     
     user_id = query.from_user.id
-    selected_plan = context.user_data.get('selected_plan')
+    template_id = context.user_data.get('selected_plan_id')
     amount = context.user_data.get('savings_amount')
+    selected_plan = template_id and amount and await run_db(db.get_savings_template, template_id)
     
-    if not selected_plan or not amount:
+    if not selected_plan:
         await query.edit_message_text("❌ Session expired. Please start over.")
         return ConversationHandler.END
     
-    # Create savings plan
-    plan_id = db.create_savings_plan(
-        telegram_id=user_id,
-        template_id=selected_plan['id'],
-        plan_name=selected_plan['name'],
-        principal_amount=amount,
-        daily_rate=selected_plan['daily_rate'],
-        duration_days=selected_plan['duration_days'],
-        is_locked=selected_plan['is_locked']
-    )
+    # Lock funds, create the plan and record it atomically
+    plan_id = await run_db(db.open_savings_plan, user_id, selected_plan, amount)
     
     if plan_id:
-        # Lock funds
-        db.lock_funds(user_id, amount)
-        
-        # Create transaction record
-        db.create_transaction(
-            telegram_id=user_id,
-            tx_type='SAVINGS_CREATED',
-            amount=amount,
-            method='SAVINGS_PLAN'
-        )
-        
-        # Log audit
-        db.log_audit(
-            action='SAVINGS_CREATED',
-            actor='USER',
-            actor_id=user_id,
-            description=f"Created {selected_plan['name']} savings plan with ${amount}",
-            reference_id=None
-        )
-        
         await query.edit_message_text(
             f"✅ <b>Savings Plan Created Successfully!</b>\n\n"
             f"📋 <b>Plan ID:</b> <code>{plan_id}</code>\n"
@@ -2237,7 +3063,7 @@ async def savings_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.edit_message_text("❌ Failed to create savings plan. Please try again.")
     
     # Clear context
-    context.user_data.pop('selected_plan', None)
+    context.user_data.pop('selected_plan_id', None)
     context.user_data.pop('savings_amount', None)
     
     return ConversationHandler.END
@@ -2248,17 +3074,18 @@ async def savings_confirm(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def add_funds(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle Add Funds button"""
+    reply = update.message.reply_text
     user_id = update.effective_user.id
-    user = db.get_user(user_id)
+    user = await run_db(db.get_user, user_id)
     
     if not user or user['status'] != 'APPROVED':
-        await update.message.reply_text(
+        await reply(
             "⏳ Your account is pending approval.",
-            reply_markup=get_main_menu(False)
+            reply_markup=PENDING_MENU
         )
         return
     
-    await update.message.reply_text(
+    await reply(
         "➕ <b>Add Funds</b>\n\n"
         "Select your deposit method:",
         reply_markup=get_crypto_methods_keyboard(),
@@ -2290,18 +3117,20 @@ async def deposit_method_callback(update: Update, context: ContextTypes.DEFAULT_
 
 async def deposit_amount(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Process deposit amount"""
+    reply = update.message.reply_text
     amount_str = update.message.text.strip()
     
     is_valid, amount, error = SecurityUtils.validate_amount(amount_str)
     if not is_valid:
-        await update.message.reply_text(f"❌ {error}\n\nPlease try again:")
+        await reply(f"❌ {error}\n\nPlease try again:")
         return DEPOSIT_AMOUNT
     
     user_id = update.effective_user.id
     method = context.user_data.get('deposit_method')
     
     # Create transaction
-    tx_id = db.create_transaction(
+    tx_id = await run_db(
+        db.create_transaction,
         telegram_id=user_id,
         tx_type='DEPOSIT',
         amount=amount,
@@ -2311,7 +3140,7 @@ async def deposit_amount(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     if tx_id:
         # Log audit
-        db.log_audit(
+        db.queue_audit(
             action='DEPOSIT_REQUESTED',
             actor='USER',
             actor_id=user_id,
@@ -2324,7 +3153,7 @@ async def deposit_amount(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
         address = get_crypto_address(method)
         
-        await update.message.reply_text(
+        await reply(
             f"✅ <b>Deposit Request Submitted</b>\n\n"
             f"📋 <b>Transaction ID:</b> <code>{tx_id}</code>\n"
             f"💰 <b>Amount:</b> <code>${amount:.2f}</code>\n"
@@ -2340,14 +3169,14 @@ async def deposit_amount(update: Update, context: ContextTypes.DEFAULT_TYPE):
             parse_mode=ParseMode.HTML
         )
     else:
-        await update.message.reply_text("❌ Failed to create deposit request. Please try again.")
+        await reply("❌ Failed to create deposit request. Please try again.")
     
     context.user_data.pop('deposit_method', None)
     return ConversationHandler.END
 
 async def notify_admin_deposit(bot, user_id: int, amount: Decimal, method: str, tx_id: str):
     """Notify admin about deposit request"""
-    user = db.get_user(user_id)
+    user = await run_db(db.get_user, user_id)
     
     keyboard = [
         [
@@ -2377,23 +3206,37 @@ async def notify_admin_deposit(bot, user_id: int, amount: Decimal, method: str,
 # WITHDRAW HANDLER
 # =========================
 
+# Address prompt per withdrawal method, keyed like context.user_data['withdraw_method']
+WITHDRAW_ADDRESS_PROMPTS = {
+    method.upper(): (
+        f"📤 <b>Enter Your {method.upper()} Address</b>\n\n"
+        f"Please provide your {method.upper()} wallet address:\n\n"
+        "⚠️ <b>Double-check your address!</b>\n"
+        "Wrong addresses cannot be recovered."
+    )
+    for method in CRYPTO_ADDRESSES
+}
+
 async def withdraw(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle Withdraw button"""
+    reply = update.message.reply_text
     user_id = update.effective_user.id
-    user = db.get_user(user_id)
+    user = await run_db(db.get_user_with_account, user_id)
     
     if not user or user['status'] != 'APPROVED':
-        await update.message.reply_text(
+        await reply(
             "⏳ Your account is pending approval.",
-            reply_markup=get_main_menu(False)
+            reply_markup=PENDING_MENU
         )
         return
     
-    account = db.get_account(user_id)
+    if user.get('available_balance') is None:
+        await reply("❌ Account not found. Please contact support.", reply_markup=MAIN_MENU)
+        return
     
-    await update.message.reply_text(
+    await reply(
         f"➖ <b>Withdrawal</b>\n\n"
-        f"Your available balance: <code>${account['available_balance']:.2f}</code>\n\n"
+        f"Your available balance: <code>${user['available_balance']:.2f}</code>\n\n"
         f"Please enter the amount you wish to withdraw:\n"
         f"(Minimum: $10.00)\n\n"
         f"Type /cancel to cancel.",
@@ -2403,20 +3246,26 @@ async def withdraw(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def withdraw_amount(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Process withdrawal amount"""
+    reply = update.message.reply_text
     amount_str = update.message.text.strip()
     
     is_valid, amount, error = SecurityUtils.validate_amount(amount_str)
     if not is_valid:
-        await update.message.reply_text(f"❌ {error}\n\nPlease try again:")
+        await reply(f"❌ {error}\n\nPlease try again:")
         return WITHDRAW_AMOUNT
     
     user_id = update.effective_user.id
-    account = db.get_account(user_id)
+    # User and balances in one round-trip; the email is needed for the OTP below
+    user = await run_db(db.get_user_with_account, user_id)
     
-    if account['available_balance'] < amount:
-        await update.message.reply_text(
+    if not user or user.get('available_balance') is None:
+        await reply("❌ Account not found. Please contact support.", reply_markup=MAIN_MENU)
+        return ConversationHandler.END
+    
+    if user['available_balance'] < amount:
+        await reply(
             f"❌ <b>Insufficient Balance</b>\n\n"
-            f"Available: <code>${account['available_balance']:.2f}</code>\n"
+            f"Available: <code>${user['available_balance']:.2f}</code>\n"
             f"Requested: <code>${amount:.2f}</code>\n\n"
             f"Please try a smaller amount.",
             parse_mode=ParseMode.HTML
@@ -2425,16 +3274,13 @@ async def withdraw_amount(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     context.user_data['withdraw_amount'] = amount
     
-    # FIX: Get user details to access email
-    user = db.get_user(user_id)
-    
     # Generate and send OTP
     otp = SecurityUtils.generate_otp()
-    db.save_otp(user_id, otp)
+    await run_db(db.save_otp, user_id, otp)
     
     await EmailService.send_otp(user['email'], otp, user['full_name'])
     
-    await update.message.reply_text(
+    await reply(
         f"📧 <b>Verification Required</b>\n\n"
         f"A 6-digit OTP code has been sent to your email: {SecurityUtils.mask_email(user['email'])}\n\n"
         f"Please enter the code to continue:",
@@ -2444,21 +3290,21 @@ async def withdraw_amount(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def withdraw_otp(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Verify OTP for withdrawal"""
+    reply = update.message.reply_text
     otp = update.message.text.strip()
     user_id = update.effective_user.id
     
     # FIX: Use database method instead of direct cursor access
-    success, message = db.verify_otp(user_id, otp)
+    success, message = await run_db(db.verify_otp, user_id, otp)
     
     if not success:
-        await update.message.reply_text(
-            f"❌ {message}\n\nPlease try again or type /cancel to quit.",
-            parse_mode=ParseMode.HTML
+        await reply(
+            f"❌ {message}\n\nPlease try again or type /cancel to quit."
         )
         return WITHDRAW_OTP
     
     # OTP verified, continue to method selection
-    await update.message.reply_text(
+    await reply(
         "✅ OTP Verified!\n\n"
         "💳 <b>Select Withdrawal Method</b>",
         reply_markup=get_crypto_methods_keyboard(),
@@ -2476,23 +3322,21 @@ async def withdraw_method_callback(update: Update, context: ContextTypes.DEFAULT
         return ConversationHandler.END
     
     method = query.data.replace("method_", "").upper()
+    prompt = WITHDRAW_ADDRESS_PROMPTS.get(method)
+    if prompt is None:
+        return WITHDRAW_METHOD
     context.user_data['withdraw_method'] = method
     
-    await query.edit_message_text(
-        f"📤 <b>Enter Your {method} Address</b>\n\n"
-        f"Please provide your {method} wallet address:\n\n"
-        f"⚠️ <b>Double-check your address!</b>\n"
-        f"Wrong addresses cannot be recovered.",
-        parse_mode=ParseMode.HTML
-    )
+    await query.edit_message_text(prompt, parse_mode=ParseMode.HTML)
     return WITHDRAW_ADDRESS
 
 async def withdraw_address(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Process withdrawal address"""
+    reply = update.message.reply_text
     address = update.message.text.strip()
     
     if len(address) < 10:
-        await update.message.reply_text("❌ Invalid address. Please try again:")
+        await reply("❌ Invalid address. Please try again:")
         return WITHDRAW_ADDRESS
     
     user_id = update.effective_user.id
@@ -2500,7 +3344,8 @@ async def withdraw_address(update: Update, context: ContextTypes.DEFAULT_TYPE):
     method = context.user_data.get('withdraw_method')
     
     # Create transaction
-    tx_id = db.create_transaction(
+    tx_id = await run_db(
+        db.create_transaction,
         telegram_id=user_id,
         tx_type='WITHDRAW',
         amount=amount,
@@ -2511,7 +3356,7 @@ async def withdraw_address(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     if tx_id:
         # Log audit
-        db.log_audit(
+        db.queue_audit(
             action='WITHDRAWAL_REQUESTED',
             actor='USER',
             actor_id=user_id,
@@ -2519,10 +3364,13 @@ async def withdraw_address(update: Update, context: ContextTypes.DEFAULT_TYPE):
             reference_id=None
         )
         
-        # Notify admin
-        await notify_admin_withdrawal(context.bot, user_id, amount, method, address, tx_id)
+        # Notify admin in the background; PTB logs the exception if it fails
+        context.application.create_task(
+            notify_admin_withdrawal(context.bot, user_id, amount, method, address, tx_id),
+            update=update
+        )
         
-        await update.message.reply_text(
+        await reply(
             f"✅ <b>Withdrawal Request Submitted</b>\n\n"
             f"📋 <b>Transaction ID:</b> <code>{tx_id}</code>\n"
             f"💰 <b>Amount:</b> <code>${amount:.2f}</code>\n"
@@ -2535,7 +3383,7 @@ async def withdraw_address(update: Update, context: ContextTypes.DEFAULT_TYPE):
             parse_mode=ParseMode.HTML
         )
     else:
-        await update.message.reply_text("❌ Failed to create withdrawal request. Please try again.")
+        await reply("❌ Failed to create withdrawal request. Please try again.")
     
     # Clear context
     context.user_data.pop('withdraw_amount', None)
@@ -2545,7 +3393,7 @@ async def withdraw_address(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def notify_admin_withdrawal(bot, user_id: int, amount: Decimal, method: str, address: str, tx_id: str):
     """Notify admin about withdrawal request"""
-    user = db.get_user(user_id)
+    user = await run_db(db.get_user, user_id)
     
     keyboard = [
         [
@@ -2578,55 +3426,49 @@ async def notify_admin_withdrawal(bot, user_id: int, amount: Decimal, method: st
 
 async def history(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show transaction history"""
+    reply = update.message.reply_text
     user_id = update.effective_user.id
-    user = db.get_user(user_id)
+    user = await run_db(db.get_user, user_id)
     
     if not user or user['status'] != 'APPROVED':
-        await update.message.reply_text(
+        await reply(
             "⏳ Your account is pending approval.",
-            reply_markup=get_main_menu(False)
+            reply_markup=PENDING_MENU
         )
         return
     
-    transactions = db.get_user_transactions(user_id, limit=10)
+    transactions = await run_db(db.get_user_transactions, user_id, limit=10)
     
     if not transactions:
-        await update.message.reply_text(
+        await reply(
             "📭 <b>No Transactions Found</b>\n\n"
             "Your transaction history will appear here.",
             parse_mode=ParseMode.HTML
         )
         return
     
-    message = "📜 <b>━━━━━━━━━━━━━━━━━━━━</b>\n"
-    message += "     TRANSACTION HISTORY\n"
-    message += "<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
+    parts = [
+        "📜 <b>━━━━━━━━━━━━━━━━━━━━</b>\n"
+        "     TRANSACTION HISTORY\n"
+        "<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
+    ]
     
     for tx in transactions:
-        icon = {
-            'DEPOSIT': '➕',
-            'WITHDRAW': '➖',
-            'SAVINGS_CREATED': '📈',
-            'INTEREST': '🎁'
-        }.get(tx['type'], '🔄')
+        icon = TX_TYPE_ICONS.get(tx.type, '🔄')
         
-        status_icon = {
-            'PENDING': '⏳',
-            'COMPLETED': '✅',
-            'REJECTED': '❌'
-        }.get(tx['status'], '❓')
+        status_icon = TX_STATUS_ICONS.get(tx.status, '❓')
         
-        message += (
-            f"{status_icon} {icon} <b>{tx['type']}</b>\n"
-            f"🆔 <code>{tx['transaction_id']}</code>\n"
-            f"💰 <code>${tx['amount']:.2f}</code>\n"
-            f"💳 {tx.get('method', 'BANK')}\n"
-            f"⏰ {tx['requested_at'].strftime('%Y-%m-%d %H:%M')}\n"
+        parts.append(
+            f"{status_icon} {icon} <b>{tx.type}</b>\n"
+            f"🆔 <code>{tx.transaction_id}</code>\n"
+            f"💰 <code>${tx.amount:.2f}</code>\n"
+            f"💳 {tx.method}\n"
+            f"⏰ {tx.requested_at.strftime('%Y-%m-%d %H:%M')}\n"
             f"━━━━━━━━━━━━━━\n"
         )
     
-    await update.message.reply_text(
-        message,
+    await reply(
+        "".join(parts),
         parse_mode=ParseMode.HTML
     )
 
@@ -2634,52 +3476,64 @@ async def history(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # SUPPORT & ABOUT HANDLER
 # =========================
 
+SUPPORT_ABOUT_TEXT = (
+    "📞 <b>━━━━━━━━━━━━━━━━━━━━</b>\n"
+    "     CUSTOMER SUPPORT\n"
+    "<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
+    "<b>Official Contact Channels</b>\n"
+    "📞 Phone: <code>+1 252 612 8324</code>\n"
+    "📧 Email: <code>pillardigitalbank47@gmail.com</code>\n"
+    "💬 Telegram: https://t.me/PillarDigitalBankCS47\n\n"
+    "⏰ <b>Support Hours:</b> 24/7\n"
+    "⏱️ <b>Response Time:</b> Within 24 hours\n\n"
+    "<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
+    "🏦 <b>ABOUT PILLAR DIGITAL BANK</b>\n\n"
+    "Pillar Digital Bank is a digital financial services platform focused on structured savings solutions, secure account management, and transparent fund administration.\n\n"
+    "<b>Core Values:</b>\n"
+    "• 🔒 Security First\n"
+    "• 📊 Transparency\n"
+    "• 🤝 Trust\n"
+    "• 💡 Innovation\n\n"
+    "<b>Services:</b>\n"
+    "• Structured digital savings programs\n"
+    "• Secure balance monitoring\n"
+    "• Manual verification protocols\n"
+    "• Dedicated client support\n\n"
+    "<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
+    "📄 <b>Terms of Use</b>\n"
+    "By using our services, you agree to our terms and conditions. We reserve the right to modify policies without prior notice.\n\n"
+    "🔐 <b>Privacy Policy</b>\n"
+    "Your data is protected and never shared with third parties. All information is securely maintained.\n\n"
+    "💰 <b>Funds Policy</b>\n"
+    "• Deposits confirmed within 1-24 hours\n"
+    "• Withdrawals processed manually\n"
+    "• Daily interest calculated at 4:30 PM NY Time\n\n"
+    "<b>━━━━━━━━━━━━━━━━━━━━</b>"
+)
+
 async def support_about(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show support and about information"""
-    message = (
-        "📞 <b>━━━━━━━━━━━━━━━━━━━━</b>\n"
-        "     CUSTOMER SUPPORT\n"
-        "<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
-        "<b>Official Contact Channels</b>\n"
-        "📞 Phone: <code>+1 252 612 8324</code>\n"
-        "📧 Email: <code>pillardigitalbank47@gmail.com</code>\n"
-        "💬 Telegram: https://t.me/PillarDigitalBankCS47\n\n"
-        "⏰ <b>Support Hours:</b> 24/7\n"
-        "⏱️ <b>Response Time:</b> Within 24 hours\n\n"
-        "<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
-        "🏦 <b>ABOUT PILLAR DIGITAL BANK</b>\n\n"
-        "Pillar Digital Bank is a digital financial services platform focused on structured savings solutions, secure account management, and transparent fund administration.\n\n"
-        "<b>Core Values:</b>\n"
-        "• 🔒 Security First\n"
-        "• 📊 Transparency\n"
-        "• 🤝 Trust\n"
-        "• 💡 Innovation\n\n"
-        "<b>Services:</b>\n"
-        "• Structured digital savings programs\n"
-        "• Secure balance monitoring\n"
-        "• Manual verification protocols\n"
-        "• Dedicated client support\n\n"
-        "<b>━━━━━━━━━━━━━━━━━━━━</b>\n\n"
-        "📄 <b>Terms of Use</b>\n"
-        "By using our services, you agree to our terms and conditions. We reserve the right to modify policies without prior notice.\n\n"
-        "🔐 <b>Privacy Policy</b>\n"
-        "Your data is protected and never shared with third parties. All information is securely maintained.\n\n"
-        "💰 <b>Funds Policy</b>\n"
-        "• Deposits confirmed within 1-24 hours\n"
-        "• Withdrawals processed manually\n"
-        "• Daily interest calculated at 4:30 PM NY Time\n\n"
-        "<b>━━━━━━━━━━━━━━━━━━━━</b>"
-    )
-    
-    keyboard = [[InlineKeyboardButton("📞 Contact Support", url=f"https://t.me/{SUPPORT_USERNAME}")]]
-    reply_markup = InlineKeyboardMarkup(keyboard)
-    
     await update.message.reply_text(
-        message,
-        reply_markup=reply_markup,
+        SUPPORT_ABOUT_TEXT,
+        reply_markup=SUPPORT_BUTTON,
         parse_mode=ParseMode.HTML
     )
 
+# =========================
+# PLACEHOLDER COMMANDS
+# =========================
+
+AUDIT_PLACEHOLDER_TEXT = "Audit logs coming soon."
+STATS_PLACEHOLDER_TEXT = "Statistics coming soon."
+
+async def audit_placeholder(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /audit command until audit views are implemented"""
+    await update.message.reply_text(AUDIT_PLACEHOLDER_TEXT)
+
+async def stats_placeholder(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /stats command until statistics are implemented"""
+    await update.message.reply_text(STATS_PLACEHOLDER_TEXT)
+
 # =========================
 # CANCEL HANDLER
 # =========================
@@ -2690,7 +3544,7 @@ async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(
         "❌ Operation cancelled.\n\n"
         "Use /start to return to main menu.",
-        reply_markup=get_main_menu(True)
+        reply_markup=MAIN_MENU
     )
     return ConversationHandler.END
 
@@ -2698,27 +3552,91 @@ async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE):
 # MENU ROUTER
 # =========================
 
+async def pending_approval(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle Pending Approval button"""
+    await update.message.reply_text(
+        "⏳ Your account is pending admin approval.\n"
+        "You'll be notified within 24-48 hours."
+    )
+
+# Exact button label -> handler, resolved with one dict lookup per message
+USER_ROUTES = {
+    "💰 My Savings": my_savings,
+    "📈 Savings Plans": savings_plans,
+    "➕ Add Funds": add_funds,
+    "➖ Withdraw": withdraw,
+    "📜 History": history,
+    "📞 Support & About": support_about,
+    "⏳ Pending Approval": pending_approval,
+}
+
+ADMIN_ROUTES = {
+    "📋 Pending Users": admin_pending_users,
+    "👥 All Users": admin_all_users,
+    "📊 Statistics": show_admin_panel,
+}
+
 async def menu_router(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Route menu button presses"""
-    text = update.message.text
-    
-    if text == "💰 My Savings":
-        await my_savings(update, context)
-    elif text == "📈 Savings Plans":
-        await savings_plans(update, context)
-    elif text == "➕ Add Funds":
-        await add_funds(update, context)
-    elif text == "➖ Withdraw":
-        await withdraw(update, context)
-    elif text == "📜 History":
-        await history(update, context)
-    elif text == "📞 Support & About":
-        await support_about(update, context)
-    elif text == "⏳ Pending Approval":
-        await update.message.reply_text(
-            "⏳ Your account is pending admin approval.\n"
-            "You'll be notified within 24-48 hours."
-        )
+    routes = ADMIN_ROUTES if is_admin(update.effective_user.id) else USER_ROUTES
+    handler = routes.get(update.message.text)
+    if handler:
+        await handler(update, context)
+
+# =========================
+# TELEGRAM REQUEST
+# =========================
+
+class OrjsonHTTPXRequest(HTTPXRequest):
+    """HTTPXRequest that decodes Bot API responses with orjson"""
+
+    @staticmethod
+    def parse_json_payload(payload: bytes) -> Dict[str, Any]:
+        # orjson rejects invalid UTF-8 outright; replace it like the stock parser
+        try:
+            return orjson.loads(payload.decode("utf-8", "replace"))
+        except orjson.JSONDecodeError as exc:
+            raise TelegramError("Invalid server response") from exc
+
+# =========================
+# UPDATE PROCESSOR
+# =========================
+
+class ChatShardedUpdateProcessor(BaseUpdateProcessor):
+    """Process updates concurrently across chats, in order within a chat"""
+
+    def __init__(self, max_concurrent_updates: int, shards: int = UPDATE_SHARDS):
+        super().__init__(max_concurrent_updates)
+        self._shards = [asyncio.Lock() for _ in range(shards)]
+
+    async def process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """Serialize updates that hash to the same chat shard"""
+        chat = update.effective_chat if isinstance(update, Update) else None
+        if chat is None:
+            await super().process_update(update, coroutine)
+            return
+
+        # Queue on the shard before taking a concurrency slot, so a burst from
+        # one chat waits here instead of holding slots other chats need
+        async with self._shards[chat.id % len(self._shards)]:
+            await super().process_update(update, coroutine)
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        await coroutine
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+# =========================
+# SCHEDULED JOBS
+# =========================
+
+async def refresh_admin_stats(context: ContextTypes.DEFAULT_TYPE):
+    """Recompute the admin panel totals"""
+    await run_db(db.refresh_admin_overview)
 
 # =========================
 # MAIN APPLICATION
@@ -2729,8 +3647,29 @@ def main():
     
     logger.info("🚀 Starting Pillar Digital Bank...")
     
+    # libuv-backed event loop for faster socket I/O (not available on Windows)
+    if sys.platform != "win32":
+        import uvloop
+        uvloop.install()
+    
     # Create application
-    app = Application.builder().token(BOT_TOKEN).build()
+    # Updates are processed concurrently so a slow handler does not hold up
+    # the rest of the queue fetched by the poller; each chat keeps its order.
+    app = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .concurrent_updates(ChatShardedUpdateProcessor(MAX_CONCURRENT_UPDATES))
+        .request(OrjsonHTTPXRequest(
+            connection_pool_size=TELEGRAM_POOL_SIZE,
+            http_version="2",
+            pool_timeout=TELEGRAM_POOL_TIMEOUT,
+            connect_timeout=5.0,
+            read_timeout=15.0,
+            write_timeout=15.0,
+        ))
+        .get_updates_request(OrjsonHTTPXRequest())
+        .build()
+    )
     
     # =========================
     # COMMAND HANDLERS
@@ -2743,8 +3682,8 @@ def main():
     # Admin commands
     app.add_handler(CommandHandler("users", admin_all_users))
     app.add_handler(CommandHandler("pending", admin_pending_users))
-    app.add_handler(CommandHandler("audit", lambda u,c: u.message.reply_text("Audit logs coming soon.")))
-    app.add_handler(CommandHandler("stats", lambda u,c: u.message.reply_text("Statistics coming soon.")))
+    app.add_handler(CommandHandler("audit", audit_placeholder))
+    app.add_handler(CommandHandler("stats", stats_placeholder))
     
     # =========================
     # REGISTRATION CONVERSATION
@@ -2826,13 +3765,19 @@ def main():
     
     app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, menu_router))
     
+    # =========================
+    # SCHEDULED JOBS
+    # =========================
+    
+    app.job_queue.run_repeating(refresh_admin_stats, interval=ADMIN_STATS_REFRESH_INTERVAL, first=0)
+    
     # =========================
     # START APPLICATION
     # =========================
     
     logger.info("✅ Bot is running. Press Ctrl+C to stop.")
     
-    app.run_polling(allowed_updates=Update.ALL_TYPES)
+    app.run_polling(allowed_updates=[Update.MESSAGE, Update.CALLBACK_QUERY])
 
 if __name__ == "__main__":
     try:
@@ -2840,7 +3785,9 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         logger.info("🛑 Bot stopped by user")
     except Exception as e:
-        logger.error(f"❌ Fatal error: {e}")
+        logger.error("❌ Fatal error: %s", e)
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db_executor.shutdown(wait=True)
+        db.close()
+        log_listener.stop()
\ No newline at end of file
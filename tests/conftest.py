@@ -0,0 +1,9 @@
+import os
+import sys
+
+# main.py validates its settings at import time; run against the in-memory backend
+os.environ.setdefault("BOT_TOKEN", "test-token")
+os.environ.setdefault("ADMIN_ID", "1")
+os.environ.pop("DATABASE_URL", None)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,57 @@
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from psycopg2 import sql
+
+import main
+
+
+class RecordingCursor:
+    """Captures the COPY statement and data bulk_load sends"""
+
+    def copy_expert(self, statement, buf):
+        self.statement = statement
+        self.data = buf.getvalue()
+
+
+def make_postgres_backend(cur):
+    backend = main.PostgresBackend.__new__(main.PostgresBackend)
+    backend._local = threading.local()
+
+    @contextmanager
+    def cursor(cursor_factory=None):
+        yield cur
+
+    backend._cursor = cursor
+    return backend
+
+
+def test_bulk_load_keeps_empty_strings_apart_from_nulls():
+    cur = RecordingCursor()
+    backend = make_postgres_backend(cur)
+
+    backend.bulk_load('audit_logs', [('LOGIN', '', None)], ('action', 'description', 'target_user'))
+
+    # Unquoted empty field is an empty string once NULL has its own marker
+    assert cur.data == 'LOGIN,,\\N\r\n'
+    assert sql.Literal(main.COPY_NULL) in cur.statement.seq
+
+
+def test_memory_interest_is_credited_once_across_views():
+    db = main.MemoryBackend()
+    db.create_user(1, 'Saver', '+15550100', 'saver@example.com', 'hash')
+    db.create_savings_plan(1, 1, 'Gold', Decimal('100'), Decimal('0.01'), 30, True)
+    plan = db.savings_plans[0]
+    plan['start_date'] -= timedelta(days=3)
+    plan['end_date'] -= timedelta(days=3)
+
+    first = db.apply_pending_interest_and_fetch(1)
+    earned = db.get_user_savings_plans(1)[0]['interest_earned']
+    second = db.apply_pending_interest_and_fetch(1)
+
+    assert earned > 0
+    assert db.get_user_savings_plans(1)[0]['interest_earned'] == earned
+    assert first['balance'] == second['balance'] == earned
+    assert second['total_interest_earned'] == earned